@@ -0,0 +1,163 @@
+"""浏览器流程基准测试：在本地复刻的登录页和签到页上跑 jlc.py 的真实浏览器流程
+
+对每个账号依次执行 启动浏览器 -> ensure_login_page -> login_with_password -> sign_in_oshwhub -> 关闭浏览器，
+统计各阶段和端到端耗时、登录跳转成功率以及滑块通过率。修改等待时间、浏览器复用或滑块逻辑前后各跑一次对比。
+
+示例: python bench/browser_bench.py --accounts 10 --workers 2 --slider-reject-rate 0.1
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jlc
+from replica_server import ReplicaServer, add_config_arguments, config_from_args
+
+PHASES = ['launch', 'login_page', 'login', 'sign_in', 'quit']
+
+def run_account(index, password):
+    """在复刻站点上跑一个账号的浏览器流程，返回各阶段耗时和结果"""
+    timings = {}
+    record = {'account': index, 'login_page': False, 'redirected': False, 'permanent': False,
+              'signed': False, 'status': ''}
+    start = time.monotonic()
+    mark = start
+    driver = None
+    try:
+        driver = jlc.create_driver(index)
+        timings['launch'] = time.monotonic() - mark
+        mark = time.monotonic()
+
+        record['login_page'], driver = jlc.ensure_login_page(driver, index)
+        timings['login_page'] = time.monotonic() - mark
+        mark = time.monotonic()
+        if not record['login_page']:
+            record['status'] = '无法进入登录页'
+            return record, timings
+
+        error_status, login_timeout, record['permanent'] = jlc.login_with_password(driver, f"bench{index}", password, index)
+        timings['login'] = time.monotonic() - mark
+        mark = time.monotonic()
+        record['redirected'] = not error_status and not login_timeout
+        if not record['redirected']:
+            record['status'] = error_status or '跳转超时'
+            return record, timings
+
+        record['status'], record['signed'] = jlc.sign_in_oshwhub(driver, index)
+        timings['sign_in'] = time.monotonic() - mark
+    except Exception as e:
+        record['status'] = f"异常: {e}"
+    finally:
+        mark = time.monotonic()
+        jlc.quit_driver(driver)
+        timings['quit'] = time.monotonic() - mark
+        record['total'] = time.monotonic() - start
+        jlc.flush_account_log(index)
+    return record, timings
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def summarize(records, timings, stats, elapsed):
+    """汇总各阶段耗时、成功率和滑块通过率"""
+    total = len(records)
+    summary = {
+        'accounts': total,
+        'elapsed': elapsed,
+        'login_page_rate': sum(r['login_page'] for r in records) / total,
+        'redirect_rate': sum(r['redirected'] for r in records) / total,
+        'sign_in_rate': sum(r['signed'] for r in records) / total,
+        'slider_attempts': stats['slider_attempts'],
+        'slider_success_rate': stats['slider_passed'] / stats['slider_attempts'] if stats['slider_attempts'] else None,
+        'slider_reasons': stats['slider_reasons'],
+        'login_page_misses': stats['login_page_misses'],
+        'phases': {},
+    }
+    for phase in PHASES + ['total']:
+        if phase == 'total':
+            values = [r['total'] for r in records]
+        else:
+            values = [t[phase] for t in timings if phase in t]
+        if values:
+            summary['phases'][phase] = {
+                'count': len(values),
+                'mean': sum(values) / len(values),
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'max': max(values),
+            }
+    return summary
+
+def print_report(summary, records):
+    jlc.log("=" * 70)
+    jlc.log("📊 浏览器流程基准测试结果:")
+    jlc.log(f"  账号数 {summary['accounts']}，总耗时 {summary['elapsed']:.1f} 秒")
+    jlc.log(f"  {'阶段':<12}{'次数':>6}{'平均':>9}{'P50':>9}{'P95':>9}{'最大':>9}")
+    for phase, row in summary['phases'].items():
+        jlc.log(f"  {phase:<12}{row['count']:>6}{row['mean']:>9.1f}{row['p50']:>9.1f}{row['p95']:>9.1f}{row['max']:>9.1f}")
+    jlc.log(f"  进入登录页成功率: {summary['login_page_rate']:.1%} (模拟未跳转 {summary['login_page_misses']} 次)")
+    jlc.log(f"  登录跳转成功率: {summary['redirect_rate']:.1%}")
+    jlc.log(f"  签到成功率: {summary['sign_in_rate']:.1%}")
+    if summary['slider_success_rate'] is None:
+        jlc.log("  滑块: 未出现")
+    else:
+        reasons = ', '.join(f"{k}={v}" for k, v in sorted(summary['slider_reasons'].items())) or '无'
+        jlc.log(f"  滑块通过率: {summary['slider_success_rate']:.1%} ({summary['slider_attempts']} 次拖动，失败原因: {reasons})")
+    failed = [r for r in records if not r['signed']]
+    for r in failed:
+        jlc.log(f"  ❌ 账号 {r['account']}: {r['status']}" + (" (永久失败，不重试)" if r['permanent'] else "")
+                + f"，用时 {r['total']:.1f} 秒")
+    jlc.log("=" * 70)
+
+def main():
+    parser = argparse.ArgumentParser(description="在本地复刻站点上测量浏览器登录和签到流程")
+    parser.add_argument('--accounts', type=int, default=5, help="测试账号数")
+    parser.add_argument('--workers', type=int, default=1, help="并发的浏览器数")
+    parser.add_argument('--bad-password-accounts', type=int, default=0,
+                        help="其中使用错误密码的账号数，用于测量登录失败的识别耗时")
+    parser.add_argument('--memory-limit', type=int, metavar='MB', help="浏览器内存上限，同 jlc.py")
+    parser.add_argument('--remote-webdriver', metavar='URL[#N]', type=jlc.parse_remote_node, action='append',
+                        help="在远程 WebDriver 节点上运行，同 jlc.py；节点需能访问本机的复刻站点")
+    parser.add_argument('--json', metavar='PATH', help="另外将结果写入 JSON 文件，便于前后对比")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    jlc.setup_logging('text')
+    server = ReplicaServer(config_from_args(args)).start()
+    jlc.OSHWHUB_SIGN_IN_URL = server.url('/oshwhub.com/sign_in')
+    jlc.BROWSERS = jlc.make_browser_manager(args.remote_webdriver, args.memory_limit)
+    jlc.log(f"复刻站点: {jlc.OSHWHUB_SIGN_IN_URL}，{args.accounts} 个账号，{args.workers} 个并发浏览器")
+
+    try:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            passwords = [args.bad_password if i <= args.bad_password_accounts else "bench-password"
+                         for i in range(1, args.accounts + 1)]
+            outcomes = list(executor.map(run_account, range(1, args.accounts + 1), passwords))
+        elapsed = time.monotonic() - start
+        records = [record for record, _ in outcomes]
+        timings = [t for _, t in outcomes]
+
+        summary = summarize(records, timings, server.stats(), elapsed)
+        summary['config'] = config_from_args(args)
+        summary['workers'] = args.workers
+        print_report(summary, records)
+        jlc.BROWSERS.close()
+        jlc.BROWSERS.report()
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'summary': summary, 'accounts': records, 'timings': timings}, f,
+                          ensure_ascii=False, indent=2)
+    finally:
+        server.stop()
+        jlc.shutdown_logging()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""嘉立创通行证登录页和开源平台签到页的本地复刻，供浏览器流程基准测试使用
+
+页面沿用线上的选择器("账号登录"按钮、账号/密码输入框、button.submit、.btn_slide/.nc_scale 滑块)，
+路径中保留 passport.jlc.com/login 和 oshwhub.com，jlc.py 中按网址判断的逻辑无需修改。
+滑块的验收规则和各处跳转延迟均可配置。
+
+单独运行可在浏览器中手动查看: python bench/replica_server.py --port 8765
+"""
+import os
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+REPLICA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replica')
+SESSION_COOKIE = 'JLC_REPLICA_SESSION'
+
+DEFAULT_CONFIG = {
+    'slider': True,                 # 点击登录后是否出现滑块
+    'slider_min_ratio': 0.95,       # 滑块至少拖到轨道可移动距离的比例
+    'slider_min_ms': 300,           # 拖动时间过短视为机器操作
+    'slider_max_ms': 10000,         # 拖动时间过长视为超时
+    'slider_require_jitter': False, # 是否要求拖动过程中有纵向抖动
+    'slider_reject_rate': 0.0,      # 满足规则后仍随机判定失败的概率(模拟风控)
+    'slider_delay_ms': 800,         # 点击登录到滑块出现的延迟
+    'redirect_delay_ms': 1500,      # 验证通过到跳转回开源平台的延迟
+    'login_page_delay_ms': 300,     # 未登录访问签到页时跳转到登录页的延迟
+    'login_page_miss_rate': 0.0,    # 未登录访问签到页时不跳转登录页的概率
+    'sign_in_render_ms': 500,       # 签到按钮渲染延迟
+    'bad_password': 'wrong-password',  # 使用该密码登录时返回"账号或密码错误"
+    'seed': 0,
+}
+
+class ReplicaState:
+    """复刻站点的会话和统计数据"""
+
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config['seed'])
+        self.lock = threading.Lock()
+        self.sessions = {}       # 会话ID -> {'username', 'pending', 'logged_in'}
+        self.signed = set()      # 已签到的账号
+        self.stats = {
+            'login_page_views': 0,
+            'login_page_misses': 0,
+            'login_attempts': 0,
+            'login_rejected': 0,
+            'slider_attempts': 0,
+            'slider_passed': 0,
+            'slider_reasons': {},
+            'sign_ins': 0,
+        }
+
+    def session(self, sid):
+        with self.lock:
+            return self.sessions.setdefault(sid, {'username': None, 'pending': None, 'logged_in': False})
+
+    def judge_slider(self, attempt):
+        """按配置的规则判定一次滑块拖动，返回失败原因，通过时返回 None"""
+        config = self.config
+        if attempt.get('ratio', 0) < config['slider_min_ratio']:
+            return 'too_short'
+        duration = attempt.get('duration_ms', 0)
+        if duration < config['slider_min_ms']:
+            return 'too_fast'
+        if duration > config['slider_max_ms']:
+            return 'too_slow'
+        if config['slider_require_jitter'] and not attempt.get('jitter'):
+            return 'no_jitter'
+        with self.lock:
+            if self.rng.random() < config['slider_reject_rate']:
+                return 'risk'
+        return None
+
+    def snapshot(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['slider_reasons'] = dict(self.stats['slider_reasons'])
+            return stats
+
+def make_handler(state):
+    """生成绑定到指定状态的请求处理类"""
+
+    class ReplicaHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _session_id(self):
+            cookie = SimpleCookie(self.headers.get('Cookie', ''))
+            if SESSION_COOKIE in cookie:
+                return cookie[SESSION_COOKIE].value, False
+            return uuid.uuid4().hex, True
+
+        def _send(self, status, body, content_type, sid=None, headers=None):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Cache-Control', 'no-store')
+            if sid is not None:
+                self.send_header('Set-Cookie', f'{SESSION_COOKIE}={sid}; Path=/')
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_json(self, payload, sid=None):
+            self._send(200, json.dumps(payload, ensure_ascii=False), 'application/json; charset=utf-8', sid)
+
+        def _render(self, name, replacements, sid=None):
+            with open(os.path.join(REPLICA_DIR, name), encoding='utf-8') as f:
+                html = f.read()
+            html = html.replace('/*CONFIG*/{}', json.dumps(state.config))
+            for key, value in replacements.items():
+                html = html.replace(key, value)
+            self._send(200, html, 'text/html; charset=utf-8', sid)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length).decode('utf-8'))
+            except ValueError:
+                return {}
+
+        def do_GET(self):
+            sid, new = self._session_id()
+            cookie_sid = sid if new else None
+            path = urlsplit(self.path).path
+            session = state.session(sid)
+
+            if path == '/oshwhub.com/sign_in':
+                if session['logged_in']:
+                    signed = session['username'] in state.signed
+                    self._render('oshwhub_sign_in.html', {
+                        '/*NICKNAME*/': session['username'],
+                        '/*SIGNED*/false': 'true' if signed else 'false',
+                    }, cookie_sid)
+                    return
+                with state.lock:
+                    miss = state.rng.random() < state.config['login_page_miss_rate']
+                    if miss:
+                        state.stats['login_page_misses'] += 1
+                if miss:
+                    self._render('oshwhub_sign_in.html', {'/*NICKNAME*/': '', '/*SIGNED*/false': 'false'}, cookie_sid)
+                    return
+                time.sleep(state.config['login_page_delay_ms'] / 1000)
+                self._send(302, '', 'text/plain', cookie_sid,
+                           {'Location': '/passport.jlc.com/login?redirect=/oshwhub.com/sign_in'})
+            elif path == '/passport.jlc.com/login':
+                with state.lock:
+                    state.stats['login_page_views'] += 1
+                self._render('passport_login.html', {}, cookie_sid)
+            elif path == '/bench/stats':
+                self._send_json(state.snapshot())
+            else:
+                self._send(404, 'not found', 'text/plain', cookie_sid)
+
+        def do_POST(self):
+            sid, new = self._session_id()
+            cookie_sid = sid if new else None
+            path = urlsplit(self.path).path
+            session = state.session(sid)
+            body = self._read_json()
+
+            if path == '/passport.jlc.com/api/login':
+                with state.lock:
+                    state.stats['login_attempts'] += 1
+                    if body.get('password') == state.config['bad_password'] or not body.get('username'):
+                        state.stats['login_rejected'] += 1
+                        rejected = True
+                    else:
+                        rejected = False
+                        session['pending'] = body.get('username')
+                        if not state.config['slider']:
+                            session['username'] = session['pending']
+                            session['logged_in'] = True
+                if rejected:
+                    self._send_json({'ok': False, 'message': '账号或密码错误'}, cookie_sid)
+                else:
+                    self._send_json({'ok': True, 'slider': state.config['slider']}, cookie_sid)
+            elif path == '/passport.jlc.com/api/slider':
+                reason = state.judge_slider(body)
+                with state.lock:
+                    state.stats['slider_attempts'] += 1
+                    if reason is None and session['pending']:
+                        state.stats['slider_passed'] += 1
+                        session['username'] = session['pending']
+                        session['logged_in'] = True
+                    else:
+                        reason = reason or 'no_login'
+                        reasons = state.stats['slider_reasons']
+                        reasons[reason] = reasons.get(reason, 0) + 1
+                self._send_json({'ok': reason is None, 'reason': reason}, cookie_sid)
+            elif path == '/oshwhub.com/api/sign':
+                with state.lock:
+                    ok = session['logged_in']
+                    if ok:
+                        state.signed.add(session['username'])
+                        state.stats['sign_ins'] += 1
+                self._send_json({'ok': ok}, cookie_sid)
+            else:
+                self._send(404, 'not found', 'text/plain', cookie_sid)
+
+    return ReplicaHandler
+
+class ReplicaServer:
+    """在本地端口上运行复刻站点的 HTTP 服务"""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        merged = dict(DEFAULT_CONFIG)
+        merged.update(config or {})
+        self.state = ReplicaState(merged)
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.state))
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="replica-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def stats(self):
+        return self.state.snapshot()
+
+def add_config_arguments(parser):
+    """把复刻站点的各项配置加入命令行参数"""
+    for key, default in DEFAULT_CONFIG.items():
+        flag = '--' + key.replace('_', '-')
+        if isinstance(default, bool):
+            parser.add_argument(flag, dest=key, type=lambda v: v.lower() in ('1', 'true', 'yes'),
+                                default=default, metavar='true|false')
+        else:
+            parser.add_argument(flag, dest=key, type=type(default), default=default)
+
+def config_from_args(args):
+    return {key: getattr(args, key) for key in DEFAULT_CONFIG}
+
+def main():
+    parser = argparse.ArgumentParser(description="启动嘉立创登录页和签到页的本地复刻")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = ReplicaServer(config_from_args(args), args.host, args.port)
+    print(f"复刻站点已启动: {server.url('/oshwhub.com/sign_in')}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats(), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,27 @@
+import os
 import sys
 import time
 import json
+import socket
+import sqlite3
+import heapq
+import hashlib
+import pstats
+import cProfile
+import argparse
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+import glob
+import shutil
 import tempfile
 import random
 import requests
+from queue import Queue
+from urllib.parse import urlencode, urljoin, urlsplit, parse_qs
+from urllib3.exceptions import NewConnectionError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -12,9 +30,359 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+try:
+    import psutil
+except ImportError:  # 未安装 psutil 时不统计进程占用，只按预估内存准入
+    psutil = None
 
-def log(msg):
-    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
+class Clock:
+    """真实时钟，脚本中的等待和取时都经由它，便于模拟模式替换为虚拟时钟"""
+
+    def __init__(self):
+        self.origin = time.monotonic()
+
+    def now(self):
+        return datetime.now()
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def run_elapsed(self):
+        """自运行开始以来经过的秒数"""
+        return time.monotonic() - self.origin
+
+    def sync(self, timestamp):
+        """接手其他线程交来的任务时对齐时间线，真实时钟无需处理"""
+        pass
+
+class VirtualClock(Clock):
+    """虚拟时钟：sleep 只推进当前线程的虚拟时间而不真正等待，线程间交接任务时用 sync 对齐时间线"""
+
+    def __init__(self, start):
+        self.start = start
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.latest = 0.0  # 所有线程中走得最远的虚拟时间，即预计总耗时
+
+    def _elapsed(self):
+        return getattr(self.local, 'elapsed', 0.0)
+
+    def _advance_to(self, elapsed):
+        self.local.elapsed = elapsed
+        with self.lock:
+            self.latest = max(self.latest, elapsed)
+
+    def now(self):
+        return self.start + timedelta(seconds=self._elapsed())
+
+    def time(self):
+        return self.start.timestamp() + self._elapsed()
+
+    def monotonic(self):
+        return self._elapsed()
+
+    def run_elapsed(self):
+        return self._elapsed()
+
+    def sleep(self, seconds):
+        self._advance_to(self._elapsed() + max(0, seconds))
+
+    def sync(self, timestamp):
+        if timestamp > self._elapsed():
+            self._advance_to(timestamp)
+
+# 全局时钟，模拟模式下替换为 VirtualClock
+CLOCK = Clock()
+
+class Deadline:
+    """时间预算，基于 CLOCK 计时，同时受上级预算约束；seconds 为 None 表示不限时"""
+
+    def __init__(self, seconds=None, parent=None):
+        self.expires_at = None if seconds is None else CLOCK.monotonic() + seconds
+        self.parent = parent
+
+    def remaining(self):
+        """剩余秒数，不限时返回 None"""
+        values = []
+        if self.expires_at is not None:
+            values.append(self.expires_at - CLOCK.monotonic())
+        if self.parent is not None:
+            parent_remaining = self.parent.remaining()
+            if parent_remaining is not None:
+                values.append(parent_remaining)
+        return max(0, min(values)) if values else None
+
+    def expired(self):
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def allows(self, seconds):
+        """剩余时间是否足够完成预计耗时 seconds 的操作"""
+        remaining = self.remaining()
+        return remaining is None or remaining >= seconds
+
+    def cap(self, seconds):
+        """单步操作的超时：不超过剩余时间"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def child(self, seconds=None):
+        return Deadline(seconds, parent=self)
+
+class TextLogSink:
+    """人类可读的日志输出，格式与原有日志一致"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        prefix = f"账号 {record['account']} - " if record['account'] is not None else ""
+        self.stream.write(f"[{record['time']}] {prefix}{record['msg']}\n")
+
+    def flush(self):
+        self.stream.flush()
+
+class JsonLogSink:
+    """每行一条 JSON 的结构化日志输出"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+class LogWriter:
+    """后台日志写入线程：调用方只负责入队，账号日志按账号缓冲，账号结束时整块输出"""
+
+    def __init__(self, sinks, buffer_accounts=True):
+        self.sinks = sinks
+        self.buffer_accounts = buffer_accounts
+        self.records = Queue()
+        self.buffers = {}  # 账号 -> 未输出的记录，只在写入线程中访问
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def emit(self, record):
+        self.records.put(('record', record))
+
+    def flush_account(self, account):
+        """输出某账号缓冲的全部日志"""
+        self.records.put(('flush', account))
+
+    def close(self):
+        self.records.put(('stop', None))
+        self.thread.join()
+
+    def run(self):
+        while True:
+            kind, value = self.records.get()
+            if kind == 'record':
+                if self.buffer_accounts and value['account'] is not None:
+                    self.buffers.setdefault(value['account'], []).append(value)
+                else:
+                    self._write(value)
+            elif kind == 'flush':
+                for record in self.buffers.pop(value, []):
+                    self._write(record)
+            else:
+                for account in sorted(self.buffers):
+                    for record in self.buffers[account]:
+                        self._write(record)
+                self.buffers.clear()
+                self._flush()
+                return
+            # 队列暂时清空时才刷新输出，避免每行一次 flush
+            if self.records.empty():
+                self._flush()
+
+    def _write(self, record):
+        for sink in self.sinks:
+            try:
+                sink.write(record)
+            except (OSError, ValueError):
+                # 输出管道已关闭时丢弃日志，不能让写入线程退出
+                pass
+
+    def _flush(self):
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except (OSError, ValueError):
+                pass
+
+# 全局日志写入器，未初始化时 log 直接同步输出
+LOGGER = None
+LOG_CONTEXT = threading.local()
+
+@contextmanager
+def log_phase(phase):
+    """设置当前线程日志记录中的阶段名"""
+    previous = getattr(LOG_CONTEXT, 'phase', None)
+    LOG_CONTEXT.phase = phase
+    try:
+        yield
+    finally:
+        LOG_CONTEXT.phase = previous
+
+def log(msg, account=None, phase=None, level=None):
+    if level is None:
+        # 沿用日志中的状态符号判断级别
+        if msg.startswith('❌'):
+            level = 'ERROR'
+        elif msg.startswith(('⚠', '❗', '⏱')):
+            level = 'WARNING'
+        else:
+            level = 'INFO'
+    now = CLOCK.now()
+    record = {
+        'ts': now.isoformat(timespec='milliseconds'),
+        'time': now.strftime('%H:%M:%S'),
+        'elapsed': round(CLOCK.run_elapsed(), 3),
+        'level': level,
+        'account': account,
+        'phase': phase or getattr(LOG_CONTEXT, 'phase', None),
+        'msg': msg,
+    }
+    if LOGGER is None:
+        TextLogSink(sys.stdout).write(record)
+        sys.stdout.flush()
+    else:
+        LOGGER.emit(record)
+
+def flush_account_log(account):
+    """账号处理结束后整块输出其缓冲日志"""
+    if LOGGER is not None:
+        LOGGER.flush_account(account)
+
+def setup_logging(log_format, json_path=None, buffer_accounts=True, stream=None):
+    """初始化后台日志写入器"""
+    global LOGGER
+    stream = stream or sys.stdout
+    sinks = [JsonLogSink(stream) if log_format == 'json' else TextLogSink(stream)]
+    if json_path:
+        sinks.append(JsonLogSink(open(json_path, 'a', encoding='utf-8')))
+    LOGGER = LogWriter(sinks, buffer_accounts)
+
+def shutdown_logging():
+    """输出剩余日志并停止写入线程"""
+    global LOGGER
+    if LOGGER is not None:
+        LOGGER.close()
+        LOGGER = None
+
+class PhaseProfiler:
+    """--profile 模式下按阶段采集 cProfile 和 tracemalloc 数据，结果写入每次运行独立的目录。
+    采集的阶段为 browser_stage(内含 capture_jlc_credentials)、http_stage(内含 execute_full_process)和 summary"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}       # 阶段 -> pstats.Stats（多次调用累加）
+        self.memory = {}      # 阶段 -> 累计的内存分配差异
+        self.snapshots = {}   # 阶段 -> 最近一次结束时的 tracemalloc 快照
+        self.summary = {}     # 阶段 -> 调用次数、耗时、已分配内存变化
+        tracemalloc.start(25)
+
+    @contextmanager
+    def phase(self, name):
+        """采集一个阶段，嵌套阶段会暂停外层采集，因此各阶段的 CPU 数据互不重复"""
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        if stack and stack[-1] is not None:
+            stack[-1].disable()
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 其他线程已经在采集，本次只记录耗时和内存
+            profile = None
+        stack.append(profile)
+
+        start_snapshot = tracemalloc.take_snapshot()
+        start_traced, _ = tracemalloc.get_traced_memory()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            stack.pop()
+            elapsed = time.perf_counter() - start_time
+            # 阶段结束时仍被持有的内存增量；tracemalloc 的峰值是全进程自启动以来的值，不能按阶段区分
+            traced_delta = tracemalloc.get_traced_memory()[0] - start_traced
+            end_snapshot = tracemalloc.take_snapshot()
+
+            with self.lock:
+                if profile is not None:
+                    if name in self.stats:
+                        self.stats[name].add(profile)
+                    else:
+                        self.stats[name] = pstats.Stats(profile)
+                for diff in end_snapshot.compare_to(start_snapshot, 'lineno'):
+                    key = str(diff.traceback)
+                    size, count = self.memory.get(name, {}).get(key, (0, 0))
+                    self.memory.setdefault(name, {})[key] = (size + diff.size_diff, count + diff.count_diff)
+                self.snapshots[name] = end_snapshot
+                entry = self.summary.setdefault(name, {'calls': 0, 'wall_seconds': 0.0, 'traced_delta_bytes': 0,
+                                                       'max_traced_delta_bytes': 0})
+                entry['calls'] += 1
+                entry['wall_seconds'] += elapsed
+                entry['traced_delta_bytes'] += traced_delta
+                entry['max_traced_delta_bytes'] = max(entry['max_traced_delta_bytes'], traced_delta)
+
+            if stack and stack[-1] is not None:
+                stack[-1].enable()
+
+    def write_report(self):
+        """写出各阶段的 .prof（可用 snakeviz 等查看）、文本统计和内存快照"""
+        with self.lock:
+            for name, stats in self.stats.items():
+                stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+                with open(os.path.join(self.output_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+                    stats.stream = f
+                    stats.sort_stats('cumulative').print_stats(40)
+            for name, snapshot in self.snapshots.items():
+                snapshot.dump(os.path.join(self.output_dir, f"{name}.tracemalloc"))
+            for name, diffs in self.memory.items():
+                top = sorted(diffs.items(), key=lambda item: item[1][0], reverse=True)[:30]
+                with open(os.path.join(self.output_dir, f"{name}_memory.txt"), 'w', encoding='utf-8') as f:
+                    for location, (size, count) in top:
+                        f.write(f"{location}: {size / 1024:.1f} KiB, {count} blocks\n")
+            with open(os.path.join(self.output_dir, "phases.json"), 'w', encoding='utf-8') as f:
+                json.dump(self.summary, f, ensure_ascii=False, indent=2)
+        log(f"📁 性能分析结果已写入: {self.output_dir}")
+
+# --profile 模式下的全局采集器，未开启时为 None
+PROFILER = None
+
+def profiled_phase(name):
+    """返回阶段采集上下文，未开启 --profile 时不做任何事"""
+    if PROFILER is None:
+        return nullcontext()
+    return PROFILER.phase(name)
+
+def profile_phase(name):
+    """装饰器：将函数作为一个性能分析阶段"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled_phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
 def format_nickname(nickname):
     """格式化昵称，只显示第一个字和最后一个字，中间用星号代替"""
@@ -108,18 +476,10 @@ def extract_secretkey_from_devtools(driver):
     
     return secretkey
 
-def get_oshwhub_points(driver, account_index):
+def get_oshwhub_points(cookie_str, account_index):
     """获取开源平台积分数量"""
     try:
-        # 获取当前页面的Cookie
-        cookies = driver.get_cookies()
-        cookie_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies])
-        
-        headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'accept': 'application/json, text/plain, */*',
-            'cookie': cookie_str
-        }
+        headers = build_oshwhub_headers(cookie_str)
         
         # 调用用户信息API获取积分
         response = requests.get("https://oshwhub.com/api/users", headers=headers, timeout=10)
@@ -127,20 +487,47 @@ def get_oshwhub_points(driver, account_index):
             data = response.json()
             if data and data.get('success'):
                 points = data.get('result', {}).get('points', 0)
-                log(f"账号 {account_index} - 📊 当前积分: {points}")
+                log(f"📊 当前积分: {points}", account=account_index)
                 return points
         
-        log(f"账号 {account_index} - ⚠ 无法获取积分信息")
+        log("⚠ 无法获取积分信息", account=account_index)
         return 0
     except Exception as e:
-        log(f"账号 {account_index} - ⚠ 获取积分失败: {e}")
+        log(f"⚠ 获取积分失败: {e}", account=account_index)
         return 0
 
+def fetch_oshwhub_user(cookie_str):
+    """查询开源平台用户信息(昵称、积分)，Cookie失效时返回 None，网络错误和服务端错误抛出异常"""
+    response = requests.get("https://oshwhub.com/api/users", headers=build_oshwhub_headers(cookie_str), timeout=10)
+    if response.status_code in (401, 403):
+        return None
+    response.raise_for_status()
+    data = response.json()
+    if not data or not data.get('success'):
+        return None
+    return data.get('result') or {}
+
+def is_connect_error(e):
+    """请求是否在建立连接阶段失败(尚未发送到服务器)，此时重试不会造成重复提交"""
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.ConnectionError):
+        reason = getattr(e.args[0], 'reason', None) if e.args else None
+        return isinstance(reason, NewConnectionError)
+    return False
+
 class JLCClient:
     """调用嘉立创接口"""
+
+    MAX_ATTEMPTS = 3                        # 单个请求的最大尝试次数
+    BACKOFF_BASE = 0.5                      # 退避基数(秒)，第 n 次重试在 [0, 基数×2^(n-1)] 内随机等待
+    BACKOFF_MAX = 8.0
+    TIMEOUT = (3.05, 10)                    # (连接超时, 读取超时)
+    RETRY_STATUS = (429, 502, 503, 504)     # 可重试的状态码
     
     def __init__(self, access_token, secretkey, account_index):
         self.base_url = "https://m.jlc.com"
+        self.session = requests.Session()  # 复用连接，重试时无需重新握手
         self.headers = {
             'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'x-jlc-clienttype': 'WEB',
@@ -156,77 +543,99 @@ class JLCClient:
         self.jindou_reward = 0   # 本次获得金豆（通过差值计算）
         self.sign_status = "未知"  # 签到状态
         self.has_reward = False  # 是否领取了额外奖励
+        self.auth_rejected = False  # 服务端明确拒绝了凭据(401/403 或查询接口返回失败)
         
-    def send_request(self, url, method='GET'):
-        """发送 API 请求"""
-        try:
-            if method.upper() == 'GET':
-                response = requests.get(url, headers=self.headers, timeout=10)
-            else:
-                response = requests.post(url, headers=self.headers, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
+    def send_request(self, url, method='GET', idempotent=False):
+        """发送 API 请求；只读接口(idempotent)遇到网络错误、网关错误或限流时按指数退避重试，
+        签到、领奖等接口只在请求确定未送达服务器(连接失败)或被限流时重试，避免重复提交"""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            retry_after = None
+            try:
+                response = self.session.request(method.upper(), url, headers=self.headers, timeout=self.TIMEOUT)
+            except requests.exceptions.RequestException as e:
+                retryable = idempotent or is_connect_error(e)
+                reason = f"请求异常 ({url}): {e}"
             else:
-                log(f"账号 {self.account_index} - ❌ 请求失败，状态码: {response.status_code}")
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        # 网关偶尔返回非 JSON 的错误页
+                        retryable = idempotent
+                        reason = f"响应不是有效的 JSON ({url})"
+                else:
+                    if response.status_code in (401, 403):
+                        log(f"❌ 请求被拒绝，凭据可能已失效，状态码: {response.status_code}", account=self.account_index)
+                        self.auth_rejected = True
+                        return None
+                    retryable = response.status_code == 429 or (idempotent and response.status_code in self.RETRY_STATUS)
+                    reason = f"请求失败，状态码: {response.status_code}"
+                    retry_after = response.headers.get('Retry-After')
+
+            if not retryable or attempt == self.MAX_ATTEMPTS:
+                log(f"❌ {reason}" + (f"，已尝试 {attempt} 次" if attempt > 1 else ""), account=self.account_index)
                 return None
-        except Exception as e:
-            log(f"账号 {self.account_index} - ❌ 请求异常 ({url}): {e}")
-            return None
+
+            delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (attempt - 1)))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.BACKOFF_MAX))
+            log(f"⚠ {reason}，{delay:.2f} 秒后重试", account=self.account_index)
+            CLOCK.sleep(delay)
+        return None
     
     def get_user_info(self):
         """获取用户信息"""
-        log(f"账号 {self.account_index} - 获取用户信息...")
+        log("获取用户信息...", account=self.account_index)
         url = f"{self.base_url}/api/appPlatform/center/setting/selectPersonalInfo"
-        data = self.send_request(url)
+        data = self.send_request(url, idempotent=True)
         
         if data and data.get('success'):
-            log(f"账号 {self.account_index} - ✅ 用户信息获取成功")
+            log("✅ 用户信息获取成功", account=self.account_index)
             return True
         else:
             error_msg = data.get('message', '未知错误') if data else '请求失败'
-            log(f"账号 {self.account_index} - ❌ 获取用户信息失败: {error_msg}")
+            log(f"❌ 获取用户信息失败: {error_msg}", account=self.account_index)
             return False
     
     def get_points(self):
         """获取金豆数量"""
-        log(f"账号 {self.account_index} - 获取金豆数量...")
+        log("获取金豆数量...", account=self.account_index)
         url = f"{self.base_url}/api/activity/front/getCustomerIntegral"
-        data = self.send_request(url)
+        data = self.send_request(url, idempotent=True)
         
         if data and data.get('success'):
             jindou_count = data.get('data', {}).get('integralVoucher', 0)
-            log(f"账号 {self.account_index} - 当前金豆: {jindou_count}")
+            log(f"当前金豆: {jindou_count}", account=self.account_index)
             return jindou_count
         else:
-            log(f"账号 {self.account_index} - ❌ 获取金豆数量失败")
+            log("❌ 获取金豆数量失败", account=self.account_index)
             return 0
     
     def check_sign_status(self):
         """检查签到状态"""
-        log(f"账号 {self.account_index} - 检查签到状态...")
+        log("检查签到状态...", account=self.account_index)
         url = f"{self.base_url}/api/activity/sign/getCurrentUserSignInConfig"
-        data = self.send_request(url)
+        data = self.send_request(url, idempotent=True)
         
         if data and data.get('success'):
             have_sign_in = data.get('data', {}).get('haveSignIn', False)
             if have_sign_in:
-                log(f"账号 {self.account_index} - ✅ 今日已签到")
+                log("✅ 今日已签到", account=self.account_index)
                 self.sign_status = "已签到过"
                 return True
             else:
-                log(f"账号 {self.account_index} - 今日未签到")
+                log("今日未签到", account=self.account_index)
                 self.sign_status = "未签到"
                 return False
         else:
             error_msg = data.get('message', '未知错误') if data else '请求失败'
-            log(f"账号 {self.account_index} - ❌ 检查签到状态失败: {error_msg}")
+            log(f"❌ 检查签到状态失败: {error_msg}", account=self.account_index)
             self.sign_status = "检查失败"
             return None
     
     def sign_in(self):
         """执行签到"""
-        log(f"账号 {self.account_index} - 执行签到...")
+        log("执行签到...", account=self.account_index)
         url = f"{self.base_url}/api/activity/sign/signIn?source=4"
         data = self.send_request(url)
         
@@ -234,18 +643,18 @@ class JLCClient:
             gain_num = data.get('data', {}).get('gainNum')
             if gain_num:
                 # 直接签到成功，获得金豆
-                log(f"账号 {self.account_index} - ✅ 签到成功，签到使金豆+{gain_num}")
+                log(f"✅ 签到成功，签到使金豆+{gain_num}", account=self.account_index)
                 self.sign_status = "签到成功"
                 return True
             else:
                 # 有奖励可领取，先领取奖励
-                log(f"账号 {self.account_index} - 有奖励可领取，先领取奖励")
+                log("有奖励可领取，先领取奖励", account=self.account_index)
                 self.has_reward = True
                 
                 # 领取奖励
                 if self.receive_voucher():
                     # 领取奖励成功后，直接视为签到完成，不再重新签到
-                    log(f"账号 {self.account_index} - ✅ 奖励领取成功，签到完成")
+                    log("✅ 奖励领取成功，签到完成", account=self.account_index)
                     self.sign_status = "领取奖励成功"
                     return True
                 else:
@@ -253,24 +662,38 @@ class JLCClient:
                     return False
         else:
             error_msg = data.get('message', '未知错误') if data else '请求失败'
-            log(f"账号 {self.account_index} - ❌ 签到失败: {error_msg}")
+            log(f"❌ 签到失败: {error_msg}", account=self.account_index)
             self.sign_status = "签到失败"
             return False
     
     def receive_voucher(self):
         """领取奖励"""
-        log(f"账号 {self.account_index} - 领取奖励...")
+        log("领取奖励...", account=self.account_index)
         url = f"{self.base_url}/api/activity/sign/receiveVoucher"
         data = self.send_request(url)
         
         if data and data.get('success'):
-            log(f"账号 {self.account_index} - ✅ 领取成功")
+            log("✅ 领取成功", account=self.account_index)
             return True
         else:
             error_msg = data.get('message', '未知错误') if data else '请求失败'
-            log(f"账号 {self.account_index} - ❌ 领取奖励失败: {error_msg}")
+            log(f"❌ 领取奖励失败: {error_msg}", account=self.account_index)
             return False
     
+    def fetch_status(self):
+        """只读查询金豆数量和今日签到状态，查询失败时返回 None；是否因凭据失效失败见 auth_rejected"""
+        data = self.send_request(f"{self.base_url}/api/activity/front/getCustomerIntegral", idempotent=True)
+        if not data:
+            return None
+        if not data.get('success'):
+            self.auth_rejected = True
+            return None
+        status = {'jindou': (data.get('data') or {}).get('integralVoucher', 0), 'jindou_signed': None}
+        data = self.send_request(f"{self.base_url}/api/activity/sign/getCurrentUserSignInConfig", idempotent=True)
+        if data and data.get('success'):
+            status['jindou_signed'] = bool((data.get('data') or {}).get('haveSignIn', False))
+        return status
+
     def calculate_jindou_difference(self):
         """计算金豆差值"""
         self.jindou_reward = self.final_jindou - self.initial_jindou
@@ -278,30 +701,31 @@ class JLCClient:
             reward_text = f" (+{self.jindou_reward})"
             if self.has_reward:
                 reward_text += "（有奖励）"
-            log(f"账号 {self.account_index} - 🎉 总金豆增加: {self.initial_jindou} → {self.final_jindou}{reward_text}")
+            log(f"🎉 总金豆增加: {self.initial_jindou} → {self.final_jindou}{reward_text}", account=self.account_index)
         elif self.jindou_reward == 0:
-            log(f"账号 {self.account_index} - ⚠ 总金豆无变化，可能今天已签到过: {self.initial_jindou} → {self.final_jindou} (0)")
+            log(f"⚠ 总金豆无变化，可能今天已签到过: {self.initial_jindou} → {self.final_jindou} (0)", account=self.account_index)
         else:
-            log(f"账号 {self.account_index} - ❗ 金豆减少: {self.initial_jindou} → {self.final_jindou} ({self.jindou_reward})")
+            log(f"❗ 金豆减少: {self.initial_jindou} → {self.final_jindou} ({self.jindou_reward})", account=self.account_index)
         
         return self.jindou_reward
     
+    @profile_phase("execute_full_process")
     def execute_full_process(self):
         """执行完整的金豆签到流程"""
-        log(f"账号 {self.account_index} - 开始完整金豆签到流程")
+        log("开始完整金豆签到流程", account=self.account_index)
         
         # 1. 获取用户信息
         if not self.get_user_info():
             return False
         
-        time.sleep(random.randint(1, 2))
+        CLOCK.sleep(random.randint(1, 2))
         
         # 2. 获取签到前金豆数量
-        log(f"账号 {self.account_index} - 获取签到前金豆数量...")
+        log("获取签到前金豆数量...", account=self.account_index)
         self.initial_jindou = self.get_points()
-        log(f"账号 {self.account_index} - 签到前金豆: {self.initial_jindou}")
+        log(f"签到前金豆: {self.initial_jindou}", account=self.account_index)
         
-        time.sleep(random.randint(1, 2))
+        CLOCK.sleep(random.randint(1, 2))
         
         # 3. 检查签到状态
         sign_status = self.check_sign_status()
@@ -309,19 +733,19 @@ class JLCClient:
             return False
         elif sign_status:  # 已签到
             # 已签到，直接获取金豆数量
-            log(f"账号 {self.account_index} - 今日已签到，跳过签到操作")
+            log("今日已签到，跳过签到操作", account=self.account_index)
         else:  # 未签到
             # 4. 执行签到
-            time.sleep(random.randint(2, 3))
+            CLOCK.sleep(random.randint(2, 3))
             if not self.sign_in():
                 return False
         
-        time.sleep(random.randint(1, 2))
+        CLOCK.sleep(random.randint(1, 2))
         
         # 5. 获取签到后金豆数量
-        log(f"账号 {self.account_index} - 获取签到后金豆数量...")
+        log("获取签到后金豆数量...", account=self.account_index)
         self.final_jindou = self.get_points()
-        log(f"账号 {self.account_index} - 签到后金豆: {self.final_jindou}")
+        log(f"签到后金豆: {self.final_jindou}", account=self.account_index)
         
         # 6. 计算金豆差值
         self.calculate_jindou_difference()
@@ -330,12 +754,12 @@ class JLCClient:
 
 def navigate_and_interact_m_jlc(driver, account_index):
     """在 m.jlc.com 进行导航和交互以触发网络请求"""
-    log(f"账号 {account_index} - 在 m.jlc.com 进行交互操作...")
+    log("在 m.jlc.com 进行交互操作...", account=account_index)
     
     try:
         WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         driver.execute_script("window.scrollTo(0, 300);")
-        time.sleep(2)
+        CLOCK.sleep(2)
         
         nav_selectors = [
             "//div[contains(text(), '我的')]",
@@ -349,115 +773,293 @@ def navigate_and_interact_m_jlc(driver, account_index):
             try:
                 element = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, selector)))
                 element.click()
-                log(f"账号 {account_index} - 点击导航元素: {selector}")
-                time.sleep(2)
+                log(f"点击导航元素: {selector}", account=account_index)
+                CLOCK.sleep(2)
                 break
             except:
                 continue
         
         driver.execute_script("window.scrollTo(0, 500);")
-        time.sleep(2)
+        CLOCK.sleep(2)
         driver.refresh()
-        time.sleep(5)
+        CLOCK.sleep(5)
         
     except Exception as e:
-        log(f"账号 {account_index} - 交互操作出错: {e}")
+        log(f"交互操作出错: {e}", account=account_index)
+
+# 个人中心页加载时会立即发出带 secretkey 的接口请求
+M_JLC_SECRETKEY_ROUTE = "https://m.jlc.com/mapp/pages/my/index"
+
+def read_token_from_local_storage(driver):
+    """静默读取 localStorage 中的 token，用于轮询"""
+    return driver.execute_script("""
+        var keys = ['X-JLC-AccessToken', 'x-jlc-accesstoken', 'accessToken', 'token', 'jlc-token'];
+        for (var i = 0; i < keys.length; i++) {
+            var value = window.localStorage.getItem(keys[i]);
+            if (value) { return value; }
+        }
+        return null;
+    """)
+
+@profile_phase("capture_jlc_credentials")
+def capture_jlc_credentials(driver, account_index, timeout=20):
+    """直接打开会触发 secretkey 请求的页面，一旦拿到 token 和 secretkey 立即返回"""
+    driver.get(M_JLC_SECRETKEY_ROUTE)
+    log("已访问 m.jlc.com 个人中心，等待 secretkey 请求...", account=account_index)
+
+    start = CLOCK.monotonic()
+    refreshed = False
+    access_token = None
+    secretkey = None
+    while CLOCK.monotonic() - start < timeout:
+        if not secretkey:
+            # 每次只会返回新产生的性能日志，逐批检查即可
+            secretkey = extract_secretkey_from_devtools(driver)
+        if not access_token:
+            try:
+                access_token = read_token_from_local_storage(driver)
+            except Exception:
+                access_token = None
+        if access_token and secretkey:
+            break
+
+        # 半程仍未观察到请求时刷新一次，让页面重新发出接口请求
+        if not refreshed and CLOCK.monotonic() - start > timeout / 2:
+            refreshed = True
+            try:
+                driver.refresh()
+            except Exception:
+                pass
+        CLOCK.sleep(0.5)
+
+    if access_token and secretkey:
+        log(f"✅ {CLOCK.monotonic() - start:.1f} 秒内捕获到 token 和 secretkey", account=account_index)
+        log(f"✅ 成功从 localStorage 提取 token: {access_token[:30]}...", account=account_index)
+        return access_token, secretkey
+
+    # 定向抓取失败时退回到逐个尝试导航元素的方式
+    log("⚠ 未能直接捕获凭据，尝试页面交互方式...", account=account_index)
+    navigate_and_interact_m_jlc(driver, account_index)
+    return extract_token_from_local_storage(driver), secretkey or extract_secretkey_from_devtools(driver)
+
+# 通行证到 m.jlc.com 的单点登录跳转，按页面跳转抓包整理；接口变化时自动退回浏览器抓取
+PASSPORT_SSO_AUTHORIZE_URL = "https://passport.jlc.com/api/cas/login/authorize"
+M_JLC_SSO_SERVICE = "https://m.jlc.com/mapp/pages/my/index"
+M_JLC_SSO_LOGIN_API = "https://m.jlc.com/api/login/loginByTicket"
+ACCESS_TOKEN_FIELDS = ['x-jlc-accesstoken', 'accesstoken', 'access_token']
+SECRETKEY_FIELDS = ['secretkey', 'secret_key']
+
+def get_browser_cookies(driver):
+    """获取浏览器中全部域名的Cookie；CDP 不可用时只能取到当前页面域名的Cookie"""
+    try:
+        return driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+    except Exception:
+        return driver.get_cookies()
+
+def find_json_value(data, fields):
+    """在嵌套的接口返回中查找第一个字段名匹配(不区分大小写)的非空字符串"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key.lower() in fields and isinstance(value, str) and value:
+                return value
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for value in values:
+        found = find_json_value(value, fields)
+        if found:
+            return found
+    return None
+
+class SsoExchange:
+    """用浏览器登录后的通行证Cookie重放 passport.jlc.com → m.jlc.com 的授权跳转，直接换取金豆接口凭据；
+    连续失败且从未成功时本轮不再尝试，避免接口变化后每个账号都白白多等一次"""
+
+    MAX_FAILURES = 3
+    MAX_REDIRECTS = 6
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.successes = 0
+
+    @property
+    def enabled(self):
+        with self.lock:
+            return self.successes > 0 or self.failures < self.MAX_FAILURES
+
+    def _record(self, success):
+        with self.lock:
+            if success:
+                self.successes += 1
+                self.failures = 0
+            else:
+                self.failures += 1
+                if self.successes == 0 and self.failures == self.MAX_FAILURES:
+                    log(f"⚠ 单点登录换取凭据连续失败 {self.failures} 次，本轮改为只用浏览器抓取")
+
+    def _get_ticket(self, session):
+        """跟随授权跳转直到拿到 ticket"""
+        url = f"{PASSPORT_SSO_AUTHORIZE_URL}?{urlencode({'service': M_JLC_SSO_SERVICE})}"
+        response = None
+        for _ in range(self.MAX_REDIRECTS):
+            response = session.get(url, allow_redirects=False, timeout=10)
+            location = response.headers.get('Location')
+            if not location:
+                break
+            url = urljoin(url, location)
+            query = parse_qs(urlsplit(url).query)
+            ticket = (query.get('ticket') or query.get('code') or [None])[0]
+            if ticket:
+                return ticket
+        if response is not None and 'json' in response.headers.get('Content-Type', ''):
+            # 返回体中的 code 字段是状态码，只按 ticket 查找
+            return find_json_value(response.json(), ['ticket'])
+        return None
+
+    def exchange(self, cookies, account_index):
+        """返回 (token, secretkey)，失败时返回 (None, None)"""
+        start = CLOCK.monotonic()
+        session = requests.Session()
+        session.headers.update({
+            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'accept': 'application/json, text/plain, */*',
+            'x-jlc-clienttype': 'WEB',
+        })
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+        try:
+            ticket = self._get_ticket(session)
+            if not ticket:
+                raise ValueError("授权跳转中未获得 ticket")
+            response = session.post(M_JLC_SSO_LOGIN_API, json={'ticket': ticket, 'service': M_JLC_SSO_SERVICE},
+                                    headers={'Referer': M_JLC_SSO_SERVICE}, timeout=10)
+            data = response.json() if 'json' in response.headers.get('Content-Type', '') else {}
+            access_token = find_json_value(data, ACCESS_TOKEN_FIELDS) or response.headers.get('x-jlc-accesstoken')
+            secretkey = find_json_value(data, SECRETKEY_FIELDS) or response.headers.get('secretkey')
+            if not access_token or not secretkey:
+                raise ValueError(f"换取接口未返回完整凭据 (状态码 {response.status_code})")
+            # 用只读接口确认凭据有效后才使用
+            if JLCClient(access_token, secretkey, account_index).fetch_status() is None:
+                raise ValueError("换取到的凭据未通过校验")
+        except Exception as e:
+            log(f"⚠ 单点登录换取凭据失败: {e}", account=account_index)
+            self._record(False)
+            return None, None
+        finally:
+            session.close()
+
+        self._record(True)
+        log(f"✅ 单点登录换取 token 和 secretkey 成功，用时 {CLOCK.monotonic() - start:.1f} 秒", account=account_index)
+        return access_token, secretkey
+
+SSO = SsoExchange()
+
+def obtain_jlc_credentials(driver, account_index, timeout=20):
+    """获取金豆接口凭据：先用通行证Cookie走单点登录接口，不成功时再打开 m.jlc.com 抓取"""
+    if SSO.enabled:
+        cookies = get_browser_cookies(driver)
+        # 远程浏览器没有 CDP，只能取到当前页面的开源平台Cookie，没有会发往通行证的Cookie时换取必然失败，
+        # 也不计入连续失败次数
+        if any(cookie.get('domain', '').lstrip('.') in ('passport.jlc.com', 'jlc.com') for cookie in cookies):
+            access_token, secretkey = SSO.exchange(cookies, account_index)
+            if access_token and secretkey:
+                return access_token, secretkey
+    return capture_jlc_credentials(driver, account_index, timeout=timeout)
 
 def is_sunday():
     """检查今天是否是周日"""
-    return datetime.now().weekday() == 6
+    return CLOCK.now().weekday() == 6
 
 def is_last_day_of_month():
     """检查今天是否是当月最后一天"""
-    today = datetime.now()
+    today = CLOCK.now()
     next_month = today.replace(day=28) + timedelta(days=4)
     last_day = next_month - timedelta(days=next_month.day)
     return today.day == last_day.day
 
-def capture_reward_info(driver, account_index, gift_type):
-    """抓取并输出奖励信息，返回礼包领取结果"""
-    try:
-        reward_elem = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, '//p[contains(text(), "恭喜获取")]'))
-        )
-        reward_text = reward_elem.text.strip()
-        gift_name = "七日礼包" if gift_type == "7天" else "月度礼包"
-        log(f"账号 {account_index} - {gift_name}领取结果：{reward_text}")
-        return f"开源平台{gift_name}领取结果: {reward_text}"
-    except Exception as e:
-        log(f"账号 {account_index} - 已点击{gift_type}好礼，未获取到奖励信息(可能已领取过或未达到领取条件)，请自行前往开源平台查看。")
-        return None
+# 签到页上的礼包按钮，按日期规则判断是否需要领取
+GIFT_TYPES = [
+    {'gift_type': '7天', 'gift_name': '七日礼包', 'button_text': '7天好礼', 'date_rule': is_sunday},
+    {'gift_type': '月度', 'gift_name': '月度礼包', 'button_text': '月度好礼', 'date_rule': is_last_day_of_month},
+]
 
-def click_gift_buttons(driver, account_index):
-    """根据日期条件点击7天好礼和月度好礼按钮，并抓取奖励信息，返回所有领取结果"""
-    reward_results = []
-    
-    if not is_sunday() and not is_last_day_of_month():
-        return reward_results
+def get_driver_cookie_str(driver):
+    """将浏览器当前页面的Cookie拼接为请求头格式"""
+    cookies = driver.get_cookies()
+    return "; ".join([f"{c['name']}={c['value']}" for c in cookies])
 
-    try:
-        # 等待一秒
-        time.sleep(1)
-        
-        log(f"账号 {account_index} - 开始点击礼包按钮...")
-        
-        sunday = is_sunday()
-        last_day = is_last_day_of_month()
+def build_oshwhub_headers(cookie_str):
+    """构造开源平台接口请求头"""
+    return {
+        'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'accept': 'application/json, text/plain, */*',
+        'content-type': 'application/json',
+        'origin': 'https://oshwhub.com',
+        'referer': 'https://oshwhub.com/sign_in',
+        'cookie': cookie_str
+    }
 
-        if sunday:
-            # 尝试点击7天好礼
-            try:
-                seven_day_gift = driver.find_element(By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="7天好礼"]')
-                seven_day_gift.click()
-                log(f"账号 {account_index} - ✅ 检测到今天是周日，成功点击7天好礼，祝你周末愉快~")
-                
-                # 等待1秒并抓取奖励信息
-                time.sleep(1)
-                reward_result = capture_reward_info(driver, account_index, "7天")
-                if reward_result:
-                    reward_results.append(reward_result)
-                
-                # 如果也是月底，刷新页面
-                if last_day:
-                    driver.refresh()
-                    time.sleep(5)
-                
-            except Exception as e:
-                log(f"账号 {account_index} - ⚠ 无法点击7天好礼: {e}")
+def get_due_gifts():
+    """根据日期规则返回今天需要领取的礼包类型"""
+    return [gift for gift in GIFT_TYPES if gift['date_rule']()]
 
-        if last_day:
-            # 尝试点击月度好礼
-            try:
-                monthly_gift = driver.find_element(By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="月度好礼"]')
-                monthly_gift.click()
-                log(f"账号 {account_index} - ✅ 检测到今天是月底，成功点击月度好礼")          
-                
-                # 等待1秒并抓取奖励信息
-                time.sleep(1)
-                reward_result = capture_reward_info(driver, account_index, "月度")
-                if reward_result:
-                    reward_results.append(reward_result)
-                
-            except Exception as e:
-                log(f"账号 {account_index} - ⚠ 无法点击月度好礼: {e}")
-            
+def make_reward_result(gift, success=False, reward='', message=''):
+    return {
+        'gift_type': gift['gift_type'],
+        'gift_name': gift['gift_name'],
+        'success': success,
+        'reward': reward,
+        'message': message
+    }
+
+def click_gift_button(driver, account_index, gift):
+    """点击签到页上的礼包按钮并读取奖励提示，返回结构化的领取结果"""
+    try:
+        # 按类名前缀匹配，不依赖构建生成的哈希后缀
+        button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable(
+            (By.XPATH, f'//div[contains(@class, "sign_text")]/span[text()="{gift["button_text"]}"]')))
+        button.click()
     except Exception as e:
-        log(f"账号 {account_index} - ❌ 点击礼包按钮时出错: {e}")
+        log(f"⚠ 无法点击{gift['button_text']}: {e}", account=account_index)
+        return make_reward_result(gift, message=f"未找到{gift['button_text']}按钮")
+    try:
+        reward_elem = WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.XPATH, '//p[contains(text(), "恭喜获取")]')))
+    except Exception:
+        log(f"已点击{gift['button_text']}，未获取到奖励信息(可能已领取过或未达到领取条件)", account=account_index)
+        return make_reward_result(gift, message='未获取到奖励信息(已领取或未达到条件)')
+    reward_text = reward_elem.text.strip()
+    log(f"✅ {gift['gift_name']}领取成功：{reward_text}", account=account_index)
+    return make_reward_result(gift, True, reward_text, '领取成功')
 
+def claim_gifts_in_browser(driver, account_index):
+    """在已登录的签到页上领取当天可领的礼包，返回领取结果列表"""
+    reward_results = []
+    with log_phase('gift'):
+        for n, gift in enumerate(get_due_gifts()):
+            if n:
+                # 刷新以关闭上一个礼包的奖励弹窗，之后等待按钮可点击即可，不再固定等待
+                try:
+                    driver.refresh()
+                except Exception:
+                    pass
+            reward_results.append(click_gift_button(driver, account_index, gift))
     return reward_results
 
-def get_user_nickname_from_api(driver, account_index):
+def format_reward_result(reward_result):
+    """格式化礼包领取结果用于总结输出"""
+    detail = reward_result['reward'] or reward_result['message']
+    status = "✅" if reward_result['success'] else "⚠"
+    return f"开源平台{reward_result['gift_name']}领取结果: {status} {detail}"
+
+def get_user_nickname_from_api(cookie_str, account_index):
     """通过API获取用户昵称"""
     try:
-        # 获取当前页面的Cookie
-        cookies = driver.get_cookies()
-        cookie_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies])
-        
-        headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'accept': 'application/json, text/plain, */*',
-            'cookie': cookie_str
-        }
+        headers = build_oshwhub_headers(cookie_str)
         
         # 调用用户信息API
         response = requests.get("https://oshwhub.com/api/users", headers=headers, timeout=10)
@@ -467,570 +1069,1712 @@ def get_user_nickname_from_api(driver, account_index):
                 nickname = data.get('result', {}).get('nickname', '')
                 if nickname:
                     formatted_nickname = format_nickname(nickname)
-                    log(f"账号 {account_index} - 👤 昵称: {formatted_nickname}")
+                    log(f"👤 昵称: {formatted_nickname}", account=account_index)
                     return formatted_nickname
         
-        log(f"账号 {account_index} - ⚠ 无法获取用户昵称")
+        log("⚠ 无法获取用户昵称", account=account_index)
         return None
     except Exception as e:
-        log(f"账号 {account_index} - ⚠ 获取用户昵称失败: {e}")
+        log(f"⚠ 获取用户昵称失败: {e}", account=account_index)
         return None
 
-def ensure_login_page(driver, account_index):
-    """确保进入登录页面，如果未检测到登录页面则重启浏览器"""
-    max_restarts = 5
-    restarts = 0
-    
-    while restarts < max_restarts:
-        try:
-            driver.get("https://oshwhub.com/sign_in")
-            log(f"账号 {account_index} - 已打开 JLC 签到页")
-            
-            time.sleep(5 + random.randint(2, 3))
-            current_url = driver.current_url
+OSHWHUB_SIGN_IN_URL = "https://oshwhub.com/sign_in"
+BROWSER_DIR_PREFIX = "jlc-chrome-"
+BROWSER_OWNER_FILE = "jlc-owner.json"   # 临时用户目录中记录创建它的运行器进程
+BROWSER_OWNER_GRACE = 600               # 没有所有者记录的目录至少保留的秒数
+MB = 1024 * 1024
 
-            # 检查是否在登录页面
-            if "passport.jlc.com/login" in current_url:
-                log(f"账号 {account_index} - ✅ 检测到未登录状态")
-                return True
-            else:
-                restarts += 1
-                if restarts < max_restarts:
-                    # 静默重启浏览器
-                    driver.quit()
-                    
-                    # 重新初始化浏览器
-                    chrome_options = Options()
-                    chrome_options.add_argument("--headless=new")
-                    chrome_options.add_argument("--no-sandbox")
-                    chrome_options.add_argument("--disable-dev-shm-usage")
-                    chrome_options.add_argument("--disable-gpu")
-                    chrome_options.add_argument("--window-size=1920,1080")
-                    chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-                    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-                    caps = DesiredCapabilities.CHROME
-                    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-                    
-                    driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-                    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                    
-                    # 静默等待后继续循环
-                    time.sleep(2)
-                else:
-                    log(f"账号 {account_index} - ❌ 重启浏览器{max_restarts}次后仍无法进入登录页面")
-                    return False
-                    
-        except Exception as e:
-            restarts += 1
-            if restarts < max_restarts:
-                try:
-                    driver.quit()
-                except:
-                    pass
-                
-                # 重新初始化浏览器
-                chrome_options = Options()
-                chrome_options.add_argument("--headless=new")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--window-size=1920,1080")
-                chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-
-                caps = DesiredCapabilities.CHROME
-                caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-                
-                driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                
-                time.sleep(2)
-            else:
-                log(f"账号 {account_index} - ❌ 重启浏览器{max_restarts}次后仍出现异常: {e}")
-                return False
-    
-    return False
+class BrowserAdmissionError(RuntimeError):
+    """内存或远程节点容量不足，或远程节点全部不可用，无法启动新的浏览器"""
 
-def sign_in_account(username, password, account_index, total_accounts, retry_count=0):
-    """为单个账号执行完整的签到流程（包含重试机制）"""
-    log(f"开始处理账号 {account_index}/{total_accounts}" + (f" (重试)" if retry_count > 0 else ""))
-    
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-    caps = DesiredCapabilities.CHROME
-    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-    
-    driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
-    wait = WebDriverWait(driver, 25)
-    
-    # 记录详细结果
-    result = {
-        'account_index': account_index,
-        'nickname': '未知',
-        'oshwhub_status': '未知',
-        'oshwhub_success': False,
-        'initial_points': 0,      # 签到前积分
-        'final_points': 0,        # 签到后积分
-        'points_reward': 0,       # 本次获得积分
-        'reward_results': [],     # 礼包领取结果
-        'jindou_status': '未知',
-        'jindou_success': False,
-        'initial_jindou': 0,
-        'final_jindou': 0,
-        'jindou_reward': 0,
-        'has_jindou_reward': False,  # 金豆是否有额外奖励
-        'token_extracted': False,
-        'secretkey_extracted': False,
-        'retry_count': retry_count
-    }
+class BrowserResourceManager:
+    """跟踪每个 Chrome/chromedriver 进程树的内存和CPU占用，按内存上限准入新浏览器并回收残留进程"""
 
-    try:
-        # 1. 确保进入登录页面
-        if not ensure_login_page(driver, account_index):
-            result['oshwhub_status'] = '无法进入登录页'
-            return result
+    def __init__(self, memory_limit_mb=None, browser_estimate_mb=400, admit_timeout=600, sample_interval=5):
+        self.memory_limit = memory_limit_mb * MB if memory_limit_mb else None
+        self.estimate = browser_estimate_mb * MB
+        self.admit_timeout = admit_timeout
+        self.sample_interval = sample_interval
+        self.cond = threading.Condition()
+        self.browsers = {}   # id(driver) -> 进程树及占用信息
+        self.pending = 0     # 已准入但尚未启动完成的浏览器
+        self.launches = 0
+        self.refused = 0
+        self.reaped = 0
+        self.peak_total = 0
+        self.browser_peaks = []
+        self.cpu_seconds = 0.0
+        self.monitor = None
+        self.stop_event = threading.Event()
 
-        current_url = driver.current_url
+    def _processes(self, info):
+        """当前属于该浏览器的全部进程，包括 chromedriver 和它启动的 Chrome 子进程"""
+        procs = []
+        root = info['process']
+        if root is not None and root.is_running():
+            procs.append(root)
+            try:
+                procs.extend(root.children(recursive=True))
+            except psutil.Error:
+                pass
+        for proc in procs:
+            info['seen'][proc.pid] = proc
+        return procs
 
-        # 2. 登录流程
-        log(f"账号 {account_index} - 检测到未登录状态，正在执行登录流程...")
+    def _sample_locked(self):
+        """采样所有浏览器进程树的RSS和CPU时间，返回当前总RSS"""
+        total = 0
+        for info in self.browsers.values():
+            if psutil is not None:
+                rss = 0
+                for proc in self._processes(info):
+                    try:
+                        rss += proc.memory_info().rss
+                        cpu = proc.cpu_times()
+                        info['cpu'][proc.pid] = cpu.user + cpu.system
+                    except psutil.Error:
+                        continue
+                info['rss'] = rss
+                info['peak'] = max(info['peak'], rss)
+            total += info['rss']
+        self.peak_total = max(self.peak_total, total)
+        return total
 
-        try:
-            phone_btn = wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(),"账号登录")]'))
-            )
-            phone_btn.click()
-            log(f"账号 {account_index} - 已切换账号登录")
-            time.sleep(2)
-        except Exception as e:
-            log(f"账号 {account_index} - 账号登录按钮可能已默认选中: {e}")
+    def sample(self):
+        with self.cond:
+            return self._sample_locked()
 
-        # 输入账号密码
-        try:
-            user_input = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@placeholder="请输入手机号码 / 客户编号 / 邮箱"]'))
-            )
-            user_input.clear()
-            user_input.send_keys(username)
+    def _fits_locked(self):
+        """按已启动浏览器的实际占用(不低于预估)和待启动数量判断能否再启动一个"""
+        if not self.browsers and not self.pending:
+            return True  # 至少允许一个浏览器，否则永远无法推进
+        self._sample_locked()
+        committed = sum(max(info['rss'], self.estimate) for info in self.browsers.values())
+        committed += (self.pending + 1) * self.estimate
+        if self.memory_limit is not None and committed > self.memory_limit:
+            return False
+        if psutil is not None and psutil.virtual_memory().available < self.estimate:
+            return False
+        return True
 
-            pwd_input = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@type="password"]'))
-            )
-            pwd_input.clear()
-            pwd_input.send_keys(password)
-            log(f"账号 {account_index} - 已输入账号密码")
-        except Exception as e:
-            log(f"账号 {account_index} - ❌ 登录输入框未找到: {e}")
-            result['oshwhub_status'] = '登录失败'
-            return result
+    def admit(self, account_index, deadline=None):
+        """等待直到有足够内存启动新浏览器，超时或预算耗尽时抛出 BrowserAdmissionError"""
+        start = CLOCK.monotonic()
+        waited = False
+        with self.cond:
+            while not self._fits_locked():
+                remaining = self.admit_timeout - (CLOCK.monotonic() - start)
+                if deadline is not None and deadline.remaining() is not None:
+                    remaining = min(remaining, deadline.remaining())
+                if remaining <= 0:
+                    self.refused += 1
+                    raise BrowserAdmissionError(f"内存不足，等待 {CLOCK.monotonic() - start:.0f} 秒后仍无法启动浏览器")
+                if not waited:
+                    log(f"⏱ 浏览器内存占用已达上限，等待其他浏览器释放 (运行中 {len(self.browsers)} 个)", account=account_index)
+                    waited = True
+                self.cond.wait(min(remaining, self.sample_interval))
+            self.pending += 1
+        if waited:
+            log(f"已获得浏览器启动许可，等待 {CLOCK.monotonic() - start:.1f} 秒", account=account_index)
 
-        # 点击登录
-        try:
-            login_btn = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.submit"))
-            )
-            login_btn.click()
-            log(f"账号 {account_index} - 已点击登录按钮")
-        except Exception as e:
-            log(f"账号 {account_index} - ❌ 登录按钮定位失败: {e}")
-            result['oshwhub_status'] = '登录失败'
-            return result
+    def cancel(self):
+        """浏览器启动失败时归还准入名额"""
+        with self.cond:
+            self.pending -= 1
+            self.cond.notify_all()
 
-        # 处理滑块验证
-        time.sleep(5)
+    def launch(self, account_index, deadline=None):
+        """经过内存准入后在本机启动无头 Chrome，并登记其进程树用于资源统计"""
+        self.admit(account_index, deadline)
+        user_data_dir = tempfile.mkdtemp(prefix=BROWSER_DIR_PREFIX)
         try:
-            slider = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, ".btn_slide"))
-            )
-            
-            track = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".nc_scale"))
-            )
-            
-            track_width = track.size['width']
-            slider_width = slider.size['width']
-            move_distance = track_width - slider_width - 10
-            
-            log(f"账号 {account_index} - 检测到滑块验证码，滑动距离: {move_distance}px")
-            
-            actions = ActionChains(driver)
-            actions.click_and_hold(slider).perform()
-            time.sleep(0.5)
-            
-            # 分段滑动
-            quick_steps = int(move_distance * 0.7)
-            for i in range(quick_steps):
-                if i % 10 == 0:
-                    time.sleep(0.01)
-                actions.move_by_offset(1, 0).perform()
-            
-            time.sleep(0.2)
-            
-            slow_steps = move_distance - quick_steps
-            for i in range(slow_steps):
-                if i % 3 == 0:
-                    time.sleep(0.02)
-                y_offset = 1 if i % 2 == 0 else -1 if i % 5 == 0 else 0
-                actions.move_by_offset(1, y_offset).perform()
-            
-            actions.release().perform()
-            log(f"账号 {account_index} - 滑块拖动完成")
-            time.sleep(5)
-            
-        except Exception as e:
-            log(f"账号 {account_index} - 滑块验证处理: {e}")
+            write_profile_owner(user_data_dir)
+            driver = webdriver.Chrome(options=chrome_options(user_data_dir), desired_capabilities=chrome_capabilities())
+        except Exception:
+            self.cancel()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        self.register(driver, account_index, user_data_dir)
+        return driver
 
-        # 等待跳转
-        log(f"账号 {account_index} - 等待登录跳转...")
-        max_wait = 25
-        for i in range(max_wait):
-            current_url = driver.current_url
-            
-            # 检查是否成功跳转回签到页面
-            if "oshwhub.com" in current_url and "passport.jlc.com" not in current_url:
-                log(f"账号 {account_index} - 成功跳转回签到页面")
-                break
-            
-            time.sleep(2)
-        else:
-            log(f"账号 {account_index} - ⚠ 跳转超时，但继续执行")
-
-        # 3. 获取用户昵称
-        nickname = get_user_nickname_from_api(driver, account_index)
-        if nickname:
-            result['nickname'] = nickname
-
-        # 4. 获取签到前积分数量
-        log(f"账号 {account_index} - 获取签到前积分数量...")
-        result['initial_points'] = get_oshwhub_points(driver, account_index)
-        log(f"账号 {account_index} - 签到前积分: {result['initial_points']}")
-
-        # 5. 开源平台签到
-        log(f"账号 {account_index} - 等待签到页加载...")
-        time.sleep(5)
+    def register(self, driver, account_index, user_data_dir):
+        """登记已启动的浏览器，之后按进程树统计其占用"""
+        process = None
+        if psutil is not None:
+            try:
+                process = psutil.Process(driver.service.process.pid)
+            except (AttributeError, psutil.Error):
+                process = None
+        info = {'account': account_index, 'user_data_dir': user_data_dir, 'process': process,
+                'seen': {}, 'cpu': {}, 'rss': 0, 'peak': 0}
+        with self.cond:
+            self.pending -= 1
+            self.launches += 1
+            self.browsers[id(driver)] = info
+            self._sample_locked()
+            if self.monitor is None and psutil is not None:
+                self.monitor = threading.Thread(target=self._monitor, name="browser-monitor", daemon=True)
+                self.monitor.start()
 
+    def release(self, driver):
+        """关闭浏览器，结束残留的子进程并删除临时用户目录"""
+        with self.cond:
+            self._sample_locked()
+            info = self.browsers.get(id(driver))
         try:
-            driver.refresh()
-            time.sleep(4)
-        except:
+            driver.quit()
+        except Exception:
             pass
+        if info is None:
+            return
+        leftovers = 0
+        if psutil is not None:
+            for proc in info['seen'].values():
+                try:
+                    if proc.is_running():
+                        proc.kill()
+                        leftovers += 1
+                except psutil.Error:
+                    pass
+        shutil.rmtree(info['user_data_dir'], ignore_errors=True)
+        with self.cond:
+            self.browsers.pop(id(driver), None)
+            self.browser_peaks.append(info['peak'])
+            self.cpu_seconds += sum(info['cpu'].values())
+            self.reaped += leftovers
+            self.cond.notify_all()
+        if leftovers:
+            log(f"⚠ 浏览器关闭后仍有 {leftovers} 个残留进程，已强制结束", account=info['account'])
 
-        # 执行开源平台签到
+    def _monitor(self):
+        """后台定期采样，记录峰值占用"""
+        while not self.stop_event.wait(self.sample_interval):
+            with self.cond:
+                self._sample_locked()
+
+    def reap_orphans(self):
+        """结束已退出的运行器残留的浏览器进程并删除其临时用户目录，返回结束的进程数；
+        同一台机器上仍在运行的其他运行器的浏览器不受影响"""
+        if psutil is None:
+            return 0
+        root = os.path.join(tempfile.gettempdir(), BROWSER_DIR_PREFIX)
+        dead = set()
+        live = set()
+        for path in glob.glob(root + '*'):
+            (live if profile_owner_alive(path) else dead).add(path)
+        killed = 0
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            try:
+                path = profile_dir_of(proc.info['name'], proc.info['cmdline'] or [], root)
+                # 目录已不存在的进程不可能属于仍在运行的运行器
+                if path is None or path in live or (path not in dead and os.path.exists(path)):
+                    continue
+                proc.kill()
+                killed += 1
+            except psutil.Error:
+                continue
+        for path in dead:
+            shutil.rmtree(path, ignore_errors=True)
+        self.reaped += killed
+        if killed:
+            log(f"⚠ 已结束 {killed} 个残留的浏览器进程")
+        return killed
+
+    def close(self):
+        self.stop_event.set()
+        if self.monitor is not None:
+            self.monitor.join(timeout=self.sample_interval)
+
+    def report(self):
+        """输出浏览器资源占用统计"""
+        if not self.launches:
+            return
+        log("浏览器资源统计:")
+        log(f"  启动 {self.launches} 次，因内存不足拒绝 {self.refused} 次，回收残留进程 {self.reaped} 个")
+        if psutil is None:
+            log("  未安装 psutil，未统计内存和CPU占用")
+            return
+        if self.browser_peaks:
+            peaks = sorted(self.browser_peaks)
+            log(f"  单个浏览器峰值内存: 中位 {peaks[len(peaks) // 2] / MB:.0f} MB，最大 {peaks[-1] / MB:.0f} MB")
+        log(f"  全部浏览器同时占用峰值: {self.peak_total / MB:.0f} MB"
+            + (f" (上限 {self.memory_limit / MB:.0f} MB)" if self.memory_limit else ""))
+        log(f"  浏览器累计CPU时间: {self.cpu_seconds:.1f} 秒")
+
+def write_profile_owner(path):
+    """在临时用户目录中记录当前进程，供其他运行器判断目录是否仍在使用"""
+    created = psutil.Process().create_time() if psutil is not None else None
+    with open(os.path.join(path, BROWSER_OWNER_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'created': created}, f)
+
+def profile_owner_alive(path):
+    """临时用户目录的创建进程是否仍在运行，无法确定时按仍在使用处理"""
+    try:
+        with open(os.path.join(path, BROWSER_OWNER_FILE), encoding='utf-8') as f:
+            owner = json.load(f)
+    except FileNotFoundError:
+        # 刚创建还未写入所有者的目录，或旧版本留下的目录，超过保留时间后才视为残留
         try:
-            # 先检查是否已经签到
+            return time.time() - os.path.getmtime(path) < BROWSER_OWNER_GRACE
+        except OSError:
+            return False
+    except (OSError, ValueError):
+        return True
+    try:
+        # 比较进程启动时间，避免进程号被复用时误判
+        return abs(psutil.Process(owner['pid']).create_time() - owner['created']) < 1
+    except psutil.NoSuchProcess:
+        return False
+    except (psutil.Error, KeyError, TypeError):
+        return True
+
+def profile_dir_of(name, cmdline, root):
+    """Chrome 进程命令行中 --user-data-dir 指定的临时用户目录，其他进程(例如查看该目录的 shell)返回 None"""
+    if 'chrom' not in (name or '').lower():
+        return None
+    for arg in cmdline:
+        if arg.startswith('--user-data-dir=' + root):
+            return arg.split('=', 1)[1].rstrip(os.sep)
+    return None
+
+class RemoteBrowserPool:
+    """在远程 WebDriver/Selenium Grid 节点上启动浏览器，按每个节点的容量限制并发会话"""
+
+    def __init__(self, nodes, admit_timeout=600, retry_interval=5, cooldown=30):
+        self.nodes = [{'url': url, 'capacity': capacity, 'active': 0, 'peak': 0,
+                       'launches': 0, 'failures': 0, 'down_until': 0.0} for url, capacity in nodes]
+        self.admit_timeout = admit_timeout
+        self.retry_interval = retry_interval
+        self.cooldown = cooldown
+        self.cond = threading.Condition()
+        self.sessions = {}   # id(driver) -> 所在节点
+        self.launches = 0
+        self.refused = 0
+
+    def _acquire(self, account_index, deadline, start, tried, error):
+        """占用负载最低且可用的节点的一个会话名额；所有节点都已尝试失败时抛出 BrowserAdmissionError"""
+        waited = False
+        with self.cond:
+            while True:
+                candidates = [node for node in self.nodes if node['url'] not in tried]
+                if not candidates:
+                    self.refused += 1
+                    raise BrowserAdmissionError("所有远程节点都无法创建浏览器会话") from error
+                now = CLOCK.monotonic()
+                ready = [node for node in candidates
+                         if node['active'] < node['capacity'] and node['down_until'] <= now]
+                if ready:
+                    node = min(ready, key=lambda n: n['active'] / n['capacity'])
+                    node['active'] += 1
+                    break
+                remaining = self.admit_timeout - (now - start)
+                if deadline is not None and deadline.remaining() is not None:
+                    remaining = min(remaining, deadline.remaining())
+                if remaining <= 0:
+                    self.refused += 1
+                    raise BrowserAdmissionError(f"远程节点容量已满，等待 {now - start:.0f} 秒后仍无法创建浏览器会话")
+                if not waited:
+                    log(f"⏱ 远程节点会话已满，等待其他浏览器释放 (运行中 {len(self.sessions)} 个)", account=account_index)
+                    waited = True
+                self.cond.wait(min(remaining, self.retry_interval))
+        if waited:
+            log(f"已获得远程节点 {node['url']} 的会话名额，等待 {CLOCK.monotonic() - start:.1f} 秒", account=account_index)
+        return node
+
+    def launch(self, account_index, deadline=None):
+        """在远程节点上创建浏览器会话，节点不可用时换下一个节点并让该节点冷却一段时间"""
+        start = CLOCK.monotonic()
+        tried = set()
+        error = None
+        while True:
+            node = self._acquire(account_index, deadline, start, tried, error)
             try:
-                signed_element = driver.find_element(By.XPATH, '//span[contains(text(),"已签到")]')
-                log(f"账号 {account_index} - ✅ 今天已经在开源平台签到过了！")
-                result['oshwhub_status'] = '已签到过'
-                result['oshwhub_success'] = True
-                
-                # 即使已签到，也尝试点击礼包按钮
-                result['reward_results'] = click_gift_buttons(driver, account_index)
-                
-            except:
-                # 如果没有找到"已签到"元素，则尝试点击"立即签到"按钮
-                try:
-                    sign_btn = wait.until(
-                        EC.element_to_be_clickable((By.XPATH, '//span[contains(text(),"立即签到")]'))
-                    )
-                    sign_btn.click()
-                    log(f"账号 {account_index} - ✅ 开源平台签到成功！")
-                    result['oshwhub_status'] = '签到成功'
-                    result['oshwhub_success'] = True
-                    
-                    # 等待签到完成
-                    time.sleep(2)
-                    
-                    # 6. 签到完成后点击7天好礼和月度好礼
-                    result['reward_results'] = click_gift_buttons(driver, account_index)
-                    
-                except Exception as e:
-                    log(f"账号 {account_index} - ❌ 开源平台签到失败，未找到签到按钮: {e}")
-                    result['oshwhub_status'] = '签到失败'
-                    
+                driver = webdriver.Remote(command_executor=node['url'], desired_capabilities=chrome_capabilities(),
+                                          options=chrome_options(), keep_alive=True)
+            except Exception as e:
+                error = e
+                tried.add(node['url'])
+                with self.cond:
+                    node['active'] -= 1
+                    node['failures'] += 1
+                    node['down_until'] = CLOCK.monotonic() + self.cooldown
+                    self.cond.notify_all()
+                log(f"⚠ 远程节点 {node['url']} 创建浏览器会话失败: {e}", account=account_index)
+                continue
+            with self.cond:
+                node['launches'] += 1
+                node['peak'] = max(node['peak'], node['active'])
+                self.launches += 1
+                self.sessions[id(driver)] = node
+            return driver
+
+    def release(self, driver):
+        """结束远程会话并归还节点名额"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self.cond:
+            node = self.sessions.pop(id(driver), None)
+            if node is not None:
+                node['active'] -= 1
+                self.cond.notify_all()
+
+    def reap_orphans(self):
+        """远程节点上的会话由节点自身超时回收，本机没有需要清理的浏览器进程"""
+        return 0
+
+    def close(self):
+        pass
+
+    def report(self):
+        """输出各远程节点的会话统计"""
+        if not self.launches and not self.refused:
+            return
+        log("远程浏览器节点统计:")
+        log(f"  创建会话 {self.launches} 次，因容量已满或节点不可用拒绝 {self.refused} 次")
+        for node in self.nodes:
+            log(f"  {node['url']}: 会话 {node['launches']} 次，失败 {node['failures']} 次，"
+                f"同时运行峰值 {node['peak']}/{node['capacity']}")
+
+def parse_remote_node(value):
+    """解析 --remote-webdriver 参数，格式为 URL 或 URL#容量"""
+    url, _, capacity = value.partition('#')
+    if not url.startswith(('http://', 'https://')):
+        raise argparse.ArgumentTypeError(f"远程 WebDriver 地址必须以 http:// 或 https:// 开头: {value}")
+    try:
+        capacity = int(capacity) if capacity else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"节点容量必须是整数: {value}")
+    if capacity < 1:
+        raise argparse.ArgumentTypeError(f"节点容量至少为 1: {value}")
+    return url, capacity
+
+def make_browser_manager(remote_nodes=None, memory_limit=None, browser_memory=400):
+    """按参数选择在本机启动浏览器还是使用远程节点"""
+    if remote_nodes:
+        log("远程浏览器节点: " + ', '.join(f"{url} (容量 {capacity})" for url, capacity in remote_nodes))
+        return RemoteBrowserPool(remote_nodes)
+    if memory_limit:
+        log(f"浏览器内存上限: {memory_limit} MB，单个浏览器预估 {browser_memory} MB")
+    return BrowserResourceManager(memory_limit, browser_memory)
+
+BROWSERS = BrowserResourceManager()
+
+def chrome_options(user_data_dir=None):
+    """无头 Chrome 的启动参数；远程节点上由节点自行创建临时用户目录"""
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    return options
+
+def chrome_capabilities():
+    caps = DesiredCapabilities.CHROME.copy()
+    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
+    return caps
+
+def create_driver(account_index, deadline=None):
+    """通过当前的浏览器管理器(本机或远程节点)启动无头 Chrome"""
+    driver = BROWSERS.launch(account_index, deadline)
+    try:
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    except Exception:
+        quit_driver(driver)
+        raise
+    return driver
+
+def quit_driver(driver):
+    """关闭浏览器并释放其占用的资源"""
+    if driver is not None:
+        BROWSERS.release(driver)
+
+def ensure_login_page(driver, account_index, deadline=None):
+    """确保进入登录页面，如果未检测到登录页面则重启浏览器，返回 (是否成功, 当前使用的浏览器)"""
+    max_restarts = 5
+    restarts = 0
+    
+    while restarts < max_restarts:
+        if deadline is not None and deadline.expired():
+            log("⏱ 时间预算耗尽，停止尝试进入登录页", account=account_index)
+            return False, driver
+        try:
+            driver.get(OSHWHUB_SIGN_IN_URL)
+            log("已打开 JLC 签到页", account=account_index)
+            
+            CLOCK.sleep(5 + random.randint(2, 3))
+            current_url = driver.current_url
+
+            # 检查是否在登录页面
+            if "passport.jlc.com/login" in current_url:
+                log("✅ 检测到未登录状态", account=account_index)
+                return True, driver
+            restarts += 1
+            if restarts >= max_restarts:
+                log(f"❌ 重启浏览器{max_restarts}次后仍无法进入登录页面", account=account_index)
+                return False, driver
         except Exception as e:
-            log(f"账号 {account_index} - ❌ 开源平台签到异常: {e}")
-            result['oshwhub_status'] = '签到异常'
+            restarts += 1
+            if restarts >= max_restarts:
+                log(f"❌ 重启浏览器{max_restarts}次后仍出现异常: {e}", account=account_index)
+                return False, driver
+
+        # 静默重启浏览器
+        quit_driver(driver)
+        try:
+            driver = create_driver(account_index, deadline)
+        except BrowserAdmissionError as e:
+            log(f"⚠ {e}", account=account_index)
+            return False, None
+        
+        # 静默等待后继续循环
+        CLOCK.sleep(2)
+    
+    return False, driver
 
-        time.sleep(3)
+# 通行证登录页的错误提示分类：账号本身的问题重试也不会成功，直接结束；其余按原流程重试
+# 只读取登录页的错误提示、全局消息和滑块提示元素，避免页面上的说明文字(如"未注册手机号验证后自动注册")被误判
+LOGIN_ERROR_SELECTORS = [
+    '.error-tip', '.el-form-item__error', '.el-message', '.ant-form-item-explain-error', '.ant-message-notice',
+    '[role="alert"]', '.nc_scale .scale_text', '.errloading',
+]
+LOGIN_PERMANENT_ERRORS = [
+    ('账号或密码错误', '账号或密码错误'),
+    ('用户名或密码错误', '账号或密码错误'),
+    ('账号或密码不正确', '账号或密码错误'),
+    ('密码不正确', '账号或密码错误'),
+    ('账号不存在', '账号不存在'),
+    ('用户不存在', '账号不存在'),
+    ('账号未注册', '账号不存在'),
+    ('账号已被锁定', '账号已锁定'),
+    ('账号已锁定', '账号已锁定'),
+    ('账号已被冻结', '账号已冻结'),
+    ('账号已冻结', '账号已冻结'),
+    ('账号已被停用', '账号已停用'),
+    ('账号已停用', '账号已停用'),
+    ('账号已被禁用', '账号已停用'),
+    ('账号已禁用', '账号已停用'),
+    ('账号已被注销', '账号已注销'),
+    ('账号已注销', '账号已注销'),
+]
+# 先于永久失败匹配，"密码错误次数过多，请稍后再试"这类提示按可重试处理
+LOGIN_RETRYABLE_ERRORS = [
+    ('验证失败', '滑块验证失败'),
+    ('点击框体重试', '滑块验证失败'),
+    ('出错了，点击刷新', '滑块验证失败'),
+    ('错误次数过多', '登录过于频繁'),
+    ('过于频繁', '登录过于频繁'),
+    ('请稍后再试', '登录过于频繁'),
+    ('系统繁忙', '登录服务繁忙'),
+    ('网络异常', '登录服务繁忙'),
+]
 
-        # 7. 获取签到后积分数量
-        log(f"账号 {account_index} - 获取签到后积分数量...")
-        result['final_points'] = get_oshwhub_points(driver, account_index)
-        log(f"账号 {account_index} - 签到后积分: {result['final_points']}")
+def classify_login_error(message):
+    """按登录页错误提示的文字分类登录失败，返回 (状态, 是否永久失败)，没有错误提示时返回 (None, False)"""
+    message = message.replace('帐号', '账号')
+    for keyword, status in LOGIN_RETRYABLE_ERRORS:
+        if keyword in message:
+            return status, False
+    for keyword, status in LOGIN_PERMANENT_ERRORS:
+        if keyword in message:
+            return status, True
+    return None, False
 
-        # 8. 计算积分差值
-        result['points_reward'] = result['final_points'] - result['initial_points']
-        if result['points_reward'] > 0:
-            log(f"账号 {account_index} - 🎉 总积分增加: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
-        elif result['points_reward'] == 0:
-            log(f"账号 {account_index} - ⚠ 总积分无变化，可能今天已签到过: {result['initial_points']} → {result['final_points']} (0)")
-        else:
-            log(f"账号 {account_index} - ❗ 积分减少: {result['initial_points']} → {result['final_points']} ({result['points_reward']})")
+def read_login_error(driver):
+    """读取登录页当前可见的错误提示元素的文字并分类"""
+    try:
+        message = driver.execute_script("""
+            var texts = [];
+            document.querySelectorAll(arguments[0]).forEach(function (el) {
+                if (el.getClientRects().length && el.innerText) texts.push(el.innerText.trim());
+            });
+            return texts.join('\n');
+        """, ', '.join(LOGIN_ERROR_SELECTORS)) or ''
+    except Exception:
+        return None, False
+    return classify_login_error(message)
+
+def login_redirected(driver):
+    """是否已经离开通行证登录页，回到开源平台"""
+    current_url = driver.current_url
+    return "oshwhub.com" in current_url and "passport.jlc.com" not in current_url
+
+def login_with_password(driver, username, password, account_index, deadline=None):
+    """在通行证登录页完成账号密码登录和滑块验证并等待跳转回开源平台，
+    返回 (失败状态或None, 是否跳转超时, 是否为重试也无法成功的永久失败)"""
+    def wait():
+        # 每次等待时按当时的剩余预算确定超时，预算将尽时不会再等满 25 秒
+        return WebDriverWait(driver, 25 if deadline is None else deadline.cap(25))
+
+    log("检测到未登录状态，正在执行登录流程...", account=account_index)
+
+    try:
+        phone_btn = wait().until(
+            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(),"账号登录")]'))
+        )
+        phone_btn.click()
+        log("已切换账号登录", account=account_index)
+        CLOCK.sleep(2)
+    except Exception as e:
+        log(f"账号登录按钮可能已默认选中: {e}", account=account_index)
+
+    # 输入账号密码
+    try:
+        user_input = wait().until(
+            EC.presence_of_element_located((By.XPATH, '//input[@placeholder="请输入手机号码 / 客户编号 / 邮箱"]'))
+        )
+        user_input.clear()
+        user_input.send_keys(username)
+
+        pwd_input = wait().until(
+            EC.presence_of_element_located((By.XPATH, '//input[@type="password"]'))
+        )
+        pwd_input.clear()
+        pwd_input.send_keys(password)
+        log("已输入账号密码", account=account_index)
+    except Exception as e:
+        log(f"❌ 登录输入框未找到: {e}", account=account_index)
+        return '登录失败', False, False
+
+    # 点击登录
+    try:
+        login_btn = wait().until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.submit"))
+        )
+        login_btn.click()
+        log("已点击登录按钮", account=account_index)
+    except Exception as e:
+        log(f"❌ 登录按钮定位失败: {e}", account=account_index)
+        return '登录失败', False, False
 
-        # 9. 金豆签到流程
-        log(f"账号 {account_index} - 开始金豆签到流程...")
-        driver.get("https://m.jlc.com/")
-        log(f"账号 {account_index} - 已访问 m.jlc.com，等待页面加载...")
-        time.sleep(10)
+    # 等待滑块或登录结果出现，账号密码错误等提示出现时立即结束
+    slider_shown = False
+    poll_end = CLOCK.monotonic() + 5
+    while CLOCK.monotonic() < poll_end:
+        error_status, permanent = read_login_error(driver)
+        if error_status:
+            log(f"❌ 登录失败: {error_status}" + ("，不再重试" if permanent else ""), account=account_index)
+            return error_status, False, permanent
+        if login_redirected(driver):
+            log("成功跳转回签到页面", account=account_index)
+            return None, False, False
+        try:
+            slider_shown = driver.find_element(By.CSS_SELECTOR, ".btn_slide").is_displayed()
+        except Exception:
+            slider_shown = False
+        if slider_shown:
+            break
+        CLOCK.sleep(0.5)
+
+    # 处理滑块验证
+    try:
+        slider = wait().until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, ".btn_slide"))
+        )
+        
+        track = wait().until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".nc_scale"))
+        )
         
-        navigate_and_interact_m_jlc(driver, account_index)
+        track_width = track.size['width']
+        slider_width = slider.size['width']
+        move_distance = track_width - slider_width - 10
         
-        access_token = extract_token_from_local_storage(driver)
-        secretkey = extract_secretkey_from_devtools(driver)
+        log(f"检测到滑块验证码，滑动距离: {move_distance}px", account=account_index)
         
-        result['token_extracted'] = bool(access_token)
-        result['secretkey_extracted'] = bool(secretkey)
+        actions = ActionChains(driver)
+        actions.click_and_hold(slider).perform()
+        CLOCK.sleep(0.5)
         
-        if access_token and secretkey:
-            log(f"账号 {account_index} - ✅ 成功提取 token 和 secretkey")
+        # 分段滑动
+        quick_steps = int(move_distance * 0.7)
+        for i in range(quick_steps):
+            if i % 10 == 0:
+                CLOCK.sleep(0.01)
+            actions.move_by_offset(1, 0).perform()
+        
+        CLOCK.sleep(0.2)
+        
+        slow_steps = move_distance - quick_steps
+        for i in range(slow_steps):
+            if i % 3 == 0:
+                CLOCK.sleep(0.02)
+            y_offset = 1 if i % 2 == 0 else -1 if i % 5 == 0 else 0
+            actions.move_by_offset(1, y_offset).perform()
+        
+        actions.release().perform()
+        log("滑块拖动完成", account=account_index)
+        
+    except Exception as e:
+        log(f"滑块验证处理: {e}", account=account_index)
+
+    # 等待跳转，滑块之后的等待也并入这里轮询，出现错误提示时不再等满
+    log("等待登录跳转...", account=account_index)
+    max_wait = 55
+    wait_end = CLOCK.monotonic() + max_wait
+    while CLOCK.monotonic() < wait_end:
+        if deadline is not None and deadline.expired():
+            log("⏱ 时间预算耗尽，停止等待跳转", account=account_index)
+            return '时间预算耗尽', False, False
+
+        # 检查是否成功跳转回签到页面
+        if login_redirected(driver):
+            log("成功跳转回签到页面", account=account_index)
+            return None, False, False
+
+        error_status, permanent = read_login_error(driver)
+        if error_status:
+            log(f"❌ 登录失败: {error_status}" + ("，不再重试" if permanent else ""), account=account_index)
+            # 滑块未通过与跳转超时同样计入滑块统计
+            return error_status, not permanent, permanent
+        
+        CLOCK.sleep(1)
+
+    log("⚠ 跳转超时，但继续执行", account=account_index)
+    return None, True, False
+
+def sign_in_oshwhub(driver, account_index):
+    """在开源平台签到页点击签到，返回 (签到状态, 是否成功)"""
+    wait = WebDriverWait(driver, 25)
+
+    log("等待签到页加载...", account=account_index)
+    CLOCK.sleep(5)
+
+    try:
+        driver.refresh()
+        CLOCK.sleep(4)
+    except:
+        pass
+
+    try:
+        # 先检查是否已经签到
+        try:
+            signed_element = driver.find_element(By.XPATH, '//span[contains(text(),"已签到")]')
+            log("✅ 今天已经在开源平台签到过了！", account=account_index)
+            return '已签到过', True
             
-            jlc_client = JLCClient(access_token, secretkey, account_index)
+        except:
+            # 如果没有找到"已签到"元素，则尝试点击"立即签到"按钮
+            try:
+                sign_btn = wait.until(
+                    EC.element_to_be_clickable((By.XPATH, '//span[contains(text(),"立即签到")]'))
+                )
+                sign_btn.click()
+                log("✅ 开源平台签到成功！", account=account_index)
+                
+                # 等待签到完成
+                CLOCK.sleep(2)
+                return '签到成功', True
+                
+            except Exception as e:
+                log(f"❌ 开源平台签到失败，未找到签到按钮: {e}", account=account_index)
+                return '签到失败', False
+                
+    except Exception as e:
+        log(f"❌ 开源平台签到异常: {e}", account=account_index)
+        return '签到异常', False
+
+@profile_phase("browser_stage")
+def run_browser_stage(username, password, account_index, total_accounts, retry_count=0, deadline=None):
+    """浏览器阶段：登录、开源平台签到并抓取凭据，完成后立即关闭浏览器，返回结果和金豆接口凭据"""
+    log(f"开始处理账号 {account_index}/{total_accounts}" + (f" (重试)" if retry_count > 0 else ""), account=account_index)
+    
+    credentials = {}
+    
+    # 记录详细结果
+    result = AccountResult(account_index, retry_count)
+
+    try:
+        driver = create_driver(account_index, deadline)
+    except BrowserAdmissionError as e:
+        log(f"⚠ {e}", account=account_index)
+        result.oshwhub_status = '资源不足，未启动浏览器'
+        result.jindou_status = '资源不足，未启动浏览器'
+        return result, credentials
+    except Exception as e:
+        log(f"❌ 浏览器启动失败: {e}", account=account_index)
+        result.oshwhub_status = '浏览器启动失败'
+        result.jindou_status = '浏览器启动失败'
+        return result, credentials
+
+    try:
+        # 1. 确保进入登录页面
+        login_page_ready, driver = ensure_login_page(driver, account_index, deadline)
+        if not login_page_ready:
+            result.oshwhub_status = '无法进入登录页'
+            return result, credentials
+
+        # 2. 登录流程
+        error_status, result.login_timeout, permanent = login_with_password(driver, username, password,
+                                                                              account_index, deadline)
+        if error_status:
+            result.oshwhub_status = error_status
+            if permanent:
+                result.jindou_status = error_status
+                result.permanent_failure = True
+            return result, credentials
+
+        # 3. 获取用户昵称
+        nickname = get_user_nickname_from_api(get_driver_cookie_str(driver), account_index)
+        if nickname:
+            result.nickname = nickname
+
+        # 4. 获取签到前积分数量
+        log("获取签到前积分数量...", account=account_index)
+        result.initial_points = get_oshwhub_points(get_driver_cookie_str(driver), account_index)
+        log(f"签到前积分: {result.initial_points}", account=account_index)
+
+        # 5. 开源平台签到
+        result.oshwhub_status, result.oshwhub_success = sign_in_oshwhub(driver, account_index)
+
+        CLOCK.sleep(3)
+
+        # 6. 周日和月底趁浏览器仍在已登录的签到页上领取礼包
+        if result.oshwhub_success and get_due_gifts():
+            result.reward_results = claim_gifts_in_browser(driver, account_index)
+
+        # 7. 保存开源平台Cookie，供HTTP阶段查询积分和凭据缓存使用
+        result.oshwhub_cookies = get_driver_cookie_str(driver)
+
+        # 8. 抓取金豆接口凭据，金豆签到在HTTP阶段执行
+        if deadline is not None and not deadline.allows(10):
+            log("⏱ 时间预算不足，跳过金豆签到", account=account_index)
+            result.jindou_status = '时间预算耗尽'
+            return result, credentials
+
+        log("开始抓取金豆签到凭据...", account=account_index)
+        capture_timeout = 20 if deadline is None else deadline.cap(20)
+        access_token, secretkey = obtain_jlc_credentials(driver, account_index, timeout=capture_timeout)
+        
+        result.token_extracted = bool(access_token)
+        result.secretkey_extracted = bool(secretkey)
+        
+        if access_token and secretkey:
+            log("✅ 成功提取 token 和 secretkey", account=account_index)
+            credentials = {'access_token': access_token, 'secretkey': secretkey}
+        else:
+            log("❌ 无法提取到 token 或 secretkey，跳过金豆签到", account=account_index)
+            result.jindou_status = 'Token提取失败'
+
+    except Exception as e:
+        log(f"❌ 程序执行错误: {e}", account=account_index)
+        result.oshwhub_status = '执行异常'
+    finally:
+        quit_driver(driver)
+        log("浏览器已关闭", account=account_index)
+    
+    return result, credentials
+
+@profile_phase("http_stage")
+def run_http_stage(result, credentials, deadline=None):
+    """HTTP阶段：只依赖浏览器阶段得到的Cookie和凭据，统计积分变化并执行金豆签到"""
+    account_index = result.account_index
+    try:
+        if result.oshwhub_cookies:
+            # 1. 获取签到后积分数量
+            log("获取签到后积分数量...", account=account_index)
+            result.final_points = get_oshwhub_points(result.oshwhub_cookies, account_index)
+            log(f"签到后积分: {result.final_points}", account=account_index)
+
+            # 2. 计算积分差值
+            result.points_reward = result.final_points - result.initial_points
+            if result.points_reward > 0:
+                log(f"🎉 总积分增加: {result.initial_points} → {result.final_points} (+{result.points_reward})", account=account_index)
+            elif result.points_reward == 0:
+                log(f"⚠ 总积分无变化，可能今天已签到过: {result.initial_points} → {result.final_points} (0)", account=account_index)
+            else:
+                log(f"❗ 积分减少: {result.initial_points} → {result.final_points} ({result.points_reward})", account=account_index)
+
+        # 3. 金豆签到流程
+        if credentials and deadline is not None and deadline.expired():
+            log("⏱ 时间预算耗尽，跳过金豆签到", account=account_index)
+            result.jindou_status = '时间预算耗尽'
+            return result
+
+        if credentials:
+            jlc_client = JLCClient(credentials['access_token'], credentials['secretkey'], account_index)
             jindou_success = jlc_client.execute_full_process()
             
             # 记录金豆签到结果
-            result['jindou_success'] = jindou_success
-            result['jindou_status'] = jlc_client.sign_status
-            result['initial_jindou'] = jlc_client.initial_jindou
-            result['final_jindou'] = jlc_client.final_jindou
-            result['jindou_reward'] = jlc_client.jindou_reward
-            result['has_jindou_reward'] = jlc_client.has_reward
+            result.jindou_success = jindou_success
+            result.jindou_status = jlc_client.sign_status
+            result.initial_jindou = jlc_client.initial_jindou
+            result.final_jindou = jlc_client.final_jindou
+            result.jindou_reward = jlc_client.jindou_reward
+            result.has_jindou_reward = jlc_client.has_reward
             
             if jindou_success:
-                log(f"账号 {account_index} - ✅ 金豆签到流程完成")
+                log("✅ 金豆签到流程完成", account=account_index)
             else:
-                log(f"账号 {account_index} - ❌ 金豆签到流程失败")
-        else:
-            log(f"账号 {account_index} - ❌ 无法提取到 token 或 secretkey，跳过金豆签到")
-            result['jindou_status'] = 'Token提取失败'
+                log("❌ 金豆签到流程失败", account=account_index)
 
     except Exception as e:
-        log(f"账号 {account_index} - ❌ 程序执行错误: {e}")
-        result['oshwhub_status'] = '执行异常'
-    finally:
-        driver.quit()
-        log(f"账号 {account_index} - 浏览器已关闭")
-    
+        log(f"❌ HTTP阶段执行错误: {e}", account=account_index)
+        result.jindou_status = '执行异常'
+
     return result
 
-def should_retry(merged_success):
-    """判断是否需要重试：如果开源平台或金豆签到未成功"""
-    need_retry = not merged_success['oshwhub'] or not merged_success['jindou']
-    return need_retry
-
-def process_single_account(username, password, account_index, total_accounts):
-    """处理单个账号，包含重试机制，并合并多次尝试的最佳结果"""
-    max_retries = 3  # 最多重试3次
-    merged_result = {
-        'account_index': account_index,
-        'nickname': '未知',
-        'oshwhub_status': '未知',
-        'oshwhub_success': False,
-        'initial_points': 0,
-        'final_points': 0,
-        'points_reward': 0,
-        'reward_results': [],     # 礼包领取结果
-        'jindou_status': '未知',
-        'jindou_success': False,
-        'initial_jindou': 0,
-        'final_jindou': 0,
-        'jindou_reward': 0,
-        'has_jindou_reward': False,
-        'token_extracted': False,
-        'secretkey_extracted': False,
-        'retry_count': 0  # 记录最后使用的retry_count
-    }
-    
-    merged_success = {'oshwhub': False, 'jindou': False}
+class RunPhases:
+    """编排逻辑调用的各阶段实现，模拟模式下替换为 SimulatedPhases"""
 
-    for attempt in range(max_retries + 1):  # 第一次执行 + 重试次数
-        result = sign_in_account(username, password, account_index, total_accounts, retry_count=attempt)
-        
+    def browser_stage(self, username, password, account_index, total_accounts, retry_count=0, deadline=None):
+        result, credentials = run_browser_stage(username, password, account_index, total_accounts,
+                                                retry_count=retry_count, deadline=deadline)
+        if CREDENTIALS is not None:
+            CREDENTIALS.update(username, credentials, result.oshwhub_cookies)
+        return result, credentials
+
+    def http_stage(self, result, credentials, deadline=None):
+        return run_http_stage(result, credentials, deadline)
+
+    def sign_in_account(self, username, password, account_index, total_accounts, retry_count=0, deadline=None):
+        with log_phase('browser'):
+            result, credentials = self.browser_stage(username, password, account_index, total_accounts, retry_count, deadline)
+        with log_phase('http'):
+            return self.http_stage(result, credentials, deadline)
+
+# 全局阶段实现
+PHASES = RunPhases()
+# 凭据缓存，为 None 时不记录
+CREDENTIALS = None
+
+class AccountResult:
+    """单个账号的签到结果；既表示一次尝试的结果，也用于合并多次尝试中最好的结果"""
+
+    __slots__ = (
+        'account_index', 'nickname',
+        'oshwhub_status', 'oshwhub_success',
+        'initial_points', 'final_points', 'points_reward',  # 签到前/后积分及本次获得积分
+        'reward_results',       # 礼包领取结果
+        'oshwhub_cookies',      # 开源平台Cookie，只在单次尝试中用于查询积分和凭据缓存，不合并到最佳结果
+        'jindou_status', 'jindou_success',
+        'initial_jindou', 'final_jindou', 'jindou_reward',
+        'has_jindou_reward',    # 金豆是否有额外奖励
+        'token_extracted', 'secretkey_extracted',
+        'login_timeout',        # 本次尝试登录跳转是否超时(通常是滑块未通过)
+        'login_timeouts',       # 合并结果中登录跳转超时的尝试次数
+        'permanent_failure',    # 账号密码错误、锁定等重试也无法成功的失败
+        'retry_count',          # 最后一次尝试的重试序号
+    )
+
+    def __init__(self, account_index, retry_count=0):
+        self.account_index = account_index
+        self.nickname = '未知'
+        self.oshwhub_status = '未知'
+        self.oshwhub_success = False
+        self.initial_points = 0
+        self.final_points = 0
+        self.points_reward = 0
+        self.reward_results = []
+        self.oshwhub_cookies = ''
+        self.jindou_status = '未知'
+        self.jindou_success = False
+        self.initial_jindou = 0
+        self.final_jindou = 0
+        self.jindou_reward = 0
+        self.has_jindou_reward = False
+        self.token_extracted = False
+        self.secretkey_extracted = False
+        self.login_timeout = False
+        self.login_timeouts = 0
+        self.permanent_failure = False
+        self.retry_count = retry_count
+
+    @classmethod
+    def budget_exhausted(cls, account_index):
+        """时间预算耗尽而未处理的账号结果"""
+        result = cls(account_index)
+        result.oshwhub_status = '时间预算耗尽，未处理'
+        result.jindou_status = '时间预算耗尽，未处理'
+        return result
+
+    @property
+    def succeeded(self):
+        return self.oshwhub_success and self.jindou_success
+
+    def needs_retry(self):
+        """开源平台或金豆签到未成功，且不是重试也无法解决的失败"""
+        return not self.succeeded and not self.permanent_failure
+
+    def merge(self, attempt):
+        """将单次尝试的结果合并到最佳结果中，返回是否还需要重试"""
         # 合并开源平台结果：如果本次成功且之前未成功，则更新
-        if result['oshwhub_success'] and not merged_success['oshwhub']:
-            merged_success['oshwhub'] = True
-            merged_result['oshwhub_status'] = result['oshwhub_status']
-            merged_result['initial_points'] = result['initial_points']
-            merged_result['final_points'] = result['final_points']
-            merged_result['points_reward'] = result['points_reward']
-            merged_result['reward_results'] = result['reward_results']  # 合并礼包结果
-            log(f"账号 {account_index} - 正在处理开源平台签到成功结果")
-        
+        if attempt.oshwhub_success and not self.oshwhub_success:
+            self.oshwhub_success = True
+            self.oshwhub_status = attempt.oshwhub_status
+            self.initial_points = attempt.initial_points
+            self.final_points = attempt.final_points
+            self.points_reward = attempt.points_reward
+            log("正在处理开源平台签到成功结果", account=self.account_index)
+
+        # 之前的尝试未领到任何礼包时，采用本次的领取结果
+        if attempt.reward_results and not any(r['success'] for r in self.reward_results):
+            self.reward_results = attempt.reward_results
+
         # 合并金豆结果：如果本次成功且之前未成功，则更新
-        if result['jindou_success'] and not merged_success['jindou']:
-            merged_success['jindou'] = True
-            merged_result['jindou_status'] = result['jindou_status']
-            merged_result['initial_jindou'] = result['initial_jindou']
-            merged_result['final_jindou'] = result['final_jindou']
-            merged_result['jindou_reward'] = result['jindou_reward']
-            merged_result['has_jindou_reward'] = result['has_jindou_reward']
-            log(f"账号 {account_index} - 正在处理金豆签到成功结果")
-        
+        if attempt.jindou_success and not self.jindou_success:
+            self.jindou_success = True
+            self.jindou_status = attempt.jindou_status
+            self.initial_jindou = attempt.initial_jindou
+            self.final_jindou = attempt.final_jindou
+            self.jindou_reward = attempt.jindou_reward
+            self.has_jindou_reward = attempt.has_jindou_reward
+            log("正在处理金豆签到成功结果", account=self.account_index)
+
+        # 未成功的项目显示最近一次的状态
+        if not self.oshwhub_success:
+            self.oshwhub_status = attempt.oshwhub_status
+        if not self.jindou_success:
+            self.jindou_status = attempt.jindou_status
+
         # 更新其他字段（如果之前未知）
-        if merged_result['nickname'] == '未知' and result['nickname'] != '未知':
-            merged_result['nickname'] = result['nickname']
-        
-        if not merged_result['token_extracted'] and result['token_extracted']:
-            merged_result['token_extracted'] = result['token_extracted']
-        
-        if not merged_result['secretkey_extracted'] and result['secretkey_extracted']:
-            merged_result['secretkey_extracted'] = result['secretkey_extracted']
-        
-        # 更新retry_count为最后一次尝试的
-        merged_result['retry_count'] = result['retry_count']
-        
-        # 检查是否还需要重试
-        if not should_retry(merged_success) or attempt >= max_retries:
-            break
-        else:
-            log(f"账号 {account_index} - 🔄 准备第 {attempt + 1} 次重试，等待 {random.randint(2, 6)} 秒后重新开始...")
-            time.sleep(random.randint(2, 6))
-    
-    # 最终设置success字段基于合并
-    merged_result['oshwhub_success'] = merged_success['oshwhub']
-    merged_result['jindou_success'] = merged_success['jindou']
-    
-    return merged_result
+        if self.nickname == '未知' and attempt.nickname != '未知':
+            self.nickname = attempt.nickname
+        self.token_extracted = self.token_extracted or attempt.token_extracted
+        self.secretkey_extracted = self.secretkey_extracted or attempt.secretkey_extracted
+        if attempt.login_timeout:
+            self.login_timeouts += 1
+        self.retry_count = attempt.retry_count
 
-def main():
-    if len(sys.argv) < 3:
-        print("用法: python jlc.py 账号1,账号2,账号3... 密码1,密码2,密码3... [失败退出标志]")
-        print("示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3")
-        print("示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3 true")
-        print("失败退出标志: 不传或任意值-关闭, true-开启(任意账号签到失败时返回非零退出码)")
-        sys.exit(1)
-    
-    usernames = [u.strip() for u in sys.argv[1].split(',') if u.strip()]
-    passwords = [p.strip() for p in sys.argv[2].split(',') if p.strip()]
-    
-    # 解析失败退出标志，默认为关闭
-    enable_failure_exit = False
-    if len(sys.argv) >= 4:
-        enable_failure_exit = (sys.argv[3].lower() == 'true')
-    
-    log(f"失败退出功能: {'开启' if enable_failure_exit else '关闭'}")
-    
-    if len(usernames) != len(passwords):
-        log("❌ 错误: 账号和密码数量不匹配!")
-        sys.exit(1)
-    
-    total_accounts = len(usernames)
-    log(f"开始处理 {total_accounts} 个账号的签到任务")
-    
-    # 存储所有账号的结果
-    all_results = []
-    
-    for i, (username, password) in enumerate(zip(usernames, passwords), 1):
-        log(f"开始处理第 {i} 个账号")
-        result = process_single_account(username, password, i, total_accounts)
-        all_results.append(result)
-        
-        if i < total_accounts:
-            wait_time = random.randint(3, 5)
-            log(f"等待 {wait_time} 秒后处理下一个账号...")
-            time.sleep(wait_time)
-    
-    # 输出详细总结
-    log("=" * 70)
-    log("📊 详细签到任务完成总结")
-    log("=" * 70)
-    
-    oshwhub_success_count = 0
-    jindou_success_count = 0
-    total_points_reward = 0
-    total_jindou_reward = 0
-    retried_accounts = []
-    
-    # 记录失败的账号
-    failed_accounts = []
-    
-    for result in all_results:
-        account_index = result['account_index']
-        nickname = result.get('nickname', '未知')
-        retry_count = result.get('retry_count', 0)
-        
-        if retry_count > 0:
-            retried_accounts.append(account_index)
-        
-        # 检查是否有失败情况
-        if not result['oshwhub_success'] or not result['jindou_success']:
-            failed_accounts.append(account_index)
-        
-        log(f"账号 {account_index} ({nickname}) 详细结果:" + (f" [重试{retry_count}次]" if retry_count > 0 else ""))
-        log(f"  ├── 开源平台: {result['oshwhub_status']}")
+        if attempt.permanent_failure:
+            self.permanent_failure = True
+            log(f"❌ 登录失败且重试无法解决({attempt.oshwhub_status})，不再重试", account=self.account_index)
+
+        return self.needs_retry()
+
+    def retry_priority(self, attempts):
+        """重试优先级，越小越先执行：尝试次数少的优先，只差一项成功的账号优先"""
+        missing = int(not self.oshwhub_success) + int(not self.jindou_success)
+        return (attempts, missing, self.account_index)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """从队列中保存的 JSON 恢复，忽略未知字段，缺少的字段取默认值"""
+        result = cls(data.get('account_index', 0))
+        for name in cls.__slots__:
+            if name in data:
+                setattr(result, name, data[name])
+        return result
+
+class RunAggregator:
+    """随账号完成逐个汇总结果：只保留计数、合计、失败账号、每个账号总结所需的少量字段和礼包领取结果，
+    不持有 AccountResult 对象，占用随账号数线性增长；明细文字在输出总结时才生成"""
+
+    # 总结明细用到的字段，每个账号只按此顺序保存一个元组
+    SUMMARY_FIELDS = ('nickname', 'retry_count', 'oshwhub_status', 'initial_points', 'final_points', 'points_reward',
+                      'jindou_status', 'initial_jindou', 'final_jindou', 'jindou_reward', 'has_jindou_reward')
+
+    def __init__(self, total_accounts):
+        self.total_accounts = total_accounts
+        self.lock = threading.Lock()
+        self.details = {}          # 账号 -> 总结明细字段元组
+        self.rewards = {}          # 账号 -> 礼包领取结果列表
+        self.oshwhub_success_count = 0
+        self.jindou_success_count = 0
+        self.total_points_reward = 0
+        self.total_jindou_reward = 0
+        self.failed_oshwhub = set()
+        self.failed_jindou = set()
+        self.permanent_failures = {}  # 账号 -> 失败状态
+        self.retried_accounts = set()
+
+    def add(self, result):
+        """记录一个已结束账号的最终结果"""
+        record = tuple(getattr(result, name) for name in self.SUMMARY_FIELDS)
+        with self.lock:
+            account_index = result.account_index
+            self.details[account_index] = record
+            if result.retry_count > 0:
+                self.retried_accounts.add(account_index)
+            if result.reward_results:
+                self.rewards[account_index] = result.reward_results
+            if result.oshwhub_success:
+                self.oshwhub_success_count += 1
+            else:
+                self.failed_oshwhub.add(account_index)
+            if result.jindou_success:
+                self.jindou_success_count += 1
+            else:
+                self.failed_jindou.add(account_index)
+            if result.points_reward > 0:
+                self.total_points_reward += result.points_reward
+            if result.jindou_reward > 0:
+                self.total_jindou_reward += result.jindou_reward
+            if result.permanent_failure:
+                self.permanent_failures[account_index] = result.oshwhub_status
+
+    @property
+    def failed_accounts(self):
+        return sorted(self.failed_oshwhub | self.failed_jindou)
+
+    def detail_lines(self, account_index):
+        """生成总结中单个账号的明细行"""
+        result = dict(zip(self.SUMMARY_FIELDS, self.details[account_index]))
+        retry_count = result['retry_count']
+        lines = [f"账号 {account_index} ({result['nickname']}) 详细结果:" + (f" [重试{retry_count}次]" if retry_count > 0 else "")]
+        lines.append(f"  ├── 开源平台: {result['oshwhub_status']}")
         
         # 显示积分变化
         if result['points_reward'] > 0:
-            log(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
-            total_points_reward += result['points_reward']
+            lines.append(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
         elif result['points_reward'] == 0 and result['initial_points'] > 0:
-            log(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (0)")
+            lines.append(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (0)")
         else:
-            log(f"  ├── 积分状态: 无法获取积分信息")
+            lines.append(f"  ├── 积分状态: 无法获取积分信息")
         
-        log(f"  ├── 金豆签到: {result['jindou_status']}")
+        lines.append(f"  ├── 金豆签到: {result['jindou_status']}")
         
         # 显示金豆变化
         if result['jindou_reward'] > 0:
             jindou_text = f"  ├── 金豆变化: {result['initial_jindou']} → {result['final_jindou']} (+{result['jindou_reward']})"
             if result['has_jindou_reward']:
                 jindou_text += "（有奖励）"
-            log(jindou_text)
-            total_jindou_reward += result['jindou_reward']
+            lines.append(jindou_text)
         elif result['jindou_reward'] == 0 and result['initial_jindou'] > 0:
-            log(f"  ├── 金豆变化: {result['initial_jindou']} → {result['final_jindou']} (0)")
+            lines.append(f"  ├── 金豆变化: {result['initial_jindou']} → {result['final_jindou']} (0)")
         else:
-            log(f"  ├── 金豆状态: 无法获取金豆信息")
-        
+            lines.append(f"  ├── 金豆状态: 无法获取金豆信息")
+        return lines
+
+class HttpStagePipeline:
+    """HTTP阶段的后台流水线：浏览器阶段结束后提交任务，浏览器即可继续处理下一个账号"""
+
+    def __init__(self, on_done, threads=1):
+        self.on_done = on_done
+        self.jobs = Queue()
+        self.clock_time = 0.0  # 工作线程最近完成任务时的最大时钟，供虚拟时钟对齐
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, job):
+        job['submitted_at'] = CLOCK.monotonic()
+        self.jobs.put(job)
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                CLOCK.sync(job['submitted_at'])
+                try:
+                    with log_phase('http'):
+                        result = PHASES.http_stage(job['result'], job['credentials'], job['deadline'])
+                except Exception as e:
+                    log(f"❌ HTTP阶段异常: {e}", account=job['result'].account_index)
+                    result = job['result']
+                try:
+                    self.on_done(job, result)
+                except Exception as e:
+                    log(f"❌ 处理签到结果时出错: {e}", account=job['result'].account_index)
+                self.clock_time = max(self.clock_time, CLOCK.monotonic())
+            finally:
+                self.jobs.task_done()
+
+    def drain(self):
+        """等待所有已提交的任务完成"""
+        self.jobs.join()
+        CLOCK.sync(self.clock_time)
+
+    def close(self):
+        self.drain()
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+class AccountHistory:
+    """账号历史运行统计，按账号哈希保存在本地 JSON 文件中，用于安排处理顺序"""
+
+    ALPHA = 0.3              # 指数滑动平均的权重
+    DEFAULT_SECONDS = 90.0   # 没有任何历史时的预计单账号耗时
+
+    def __init__(self, path):
+        self.path = path
+        self.stats = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.stats = json.load(f)
+            except Exception as e:
+                log(f"⚠ 读取历史统计失败，将重新记录: {e}")
+
+    def _default_seconds(self):
+        known = sorted(s['avg_seconds'] for s in self.stats.values())
+        return known[len(known) // 2] if known else self.DEFAULT_SECONDS
+
+    def expected_seconds(self, key):
+        """预计该账号本轮的总耗时（含重试）"""
+        stats = self.stats.get(key)
+        return stats['avg_seconds'] if stats else self._default_seconds()
+
+    def priority(self, key):
+        """排序权重：预计耗时越长、越容易需要重试的账号越早开始"""
+        stats = self.stats.get(key) or {}
+        flakiness = stats.get('retry_rate', 0) + stats.get('slider_retry_rate', 0) + stats.get('jindou_fail_rate', 0)
+        return self.expected_seconds(key) * (1 + flakiness)
+
+    def order(self, keys):
+        """返回按优先级从高到低排列的账号下标"""
+        return sorted(range(len(keys)), key=lambda i: -self.priority(keys[i]))
+
+    def record(self, key, seconds, attempts, login_timeouts, jindou_first_failed, success):
+        """记录一次运行的结果，各项统计以指数滑动平均更新"""
+        observed = {
+            'avg_seconds': seconds,
+            'avg_attempts': attempts,
+            'retry_rate': 1.0 if attempts > 1 else 0.0,
+            'slider_retry_rate': 1.0 if login_timeouts > 0 else 0.0,
+            'jindou_fail_rate': 1.0 if jindou_first_failed else 0.0,
+            'fail_rate': 0.0 if success else 1.0,
+        }
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = dict(observed, runs=0)
+        else:
+            for name, value in observed.items():
+                stats[name] = round(stats.get(name, value) * (1 - self.ALPHA) + value * self.ALPHA, 3)
+        stats['runs'] = stats.get('runs', 0) + 1
+        stats['last_run'] = CLOCK.now().strftime('%Y-%m-%d')
+        self.stats[key] = stats
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+class CredentialStore:
+    """按账号哈希缓存金豆接口凭据和开源平台Cookie，供 status 命令免登录查询，文件权限为仅本人可读写"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                log(f"⚠ 读取凭据缓存失败，将重新记录: {e}")
+
+    def get(self, username):
+        with self.lock:
+            return dict(self.entries.get(account_key(username)) or {})
+
+    def update(self, username, credentials=None, oshwhub_cookies=''):
+        """记录新获取的凭据，未获取到的部分保留原值"""
+        fields = dict(credentials or {})
+        if oshwhub_cookies:
+            fields['oshwhub_cookies'] = oshwhub_cookies
+        if not fields:
+            return
+        with self.lock:
+            entry = self.entries.setdefault(account_key(username), {})
+            entry.update(fields)
+            entry['updated'] = CLOCK.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._save_locked()
+
+    def _save_locked(self):
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+class WorkScheduler:
+    """浏览器工作线程的任务分配：首轮按给定顺序分发，首轮分完后再分发重试，预算不足时停止"""
+
+    def __init__(self, order, run_deadline, workers):
+        self.first_pass = list(order)
+        self.retry_heap = []
+        self.run_deadline = run_deadline
+        self.in_progress = 0
+        self.stopped = False
+        self.attempt_seconds = []
+        self.cond = threading.Condition()
+        # 虚拟时钟下，让虚拟时间最早的空闲线程先领取任务，保证模拟的分配顺序与真实一致
+        self.virtual = isinstance(CLOCK, VirtualClock)
+        self.waiting = {}
+        self.active_workers = workers
+
+    def _my_turn(self, worker):
+        if not self.virtual:
+            return True
+        mine = (self.waiting[worker], worker)
+        return len(self.waiting) == self.active_workers and all(
+            (t, w) >= mine for w, t in self.waiting.items()
+        )
+
+    def next_task(self, worker):
+        """领取下一个账号下标，没有任务时返回 None"""
+        with self.cond:
+            self.waiting[worker] = CLOCK.monotonic()
+            try:
+                while True:
+                    if self.stopped or self.run_deadline.expired():
+                        return None
+                    if self.first_pass and self._my_turn(worker):
+                        self.in_progress += 1
+                        return self.first_pass.pop(0)
+                    if not self.first_pass and self.retry_heap and self._my_turn(worker):
+                        estimate = sorted(self.attempt_seconds)[len(self.attempt_seconds) // 2] if self.attempt_seconds else 0
+                        if not self.run_deadline.allows(estimate):
+                            log(f"⏱ 剩余时间预算不足一次尝试的预计耗时({estimate:.0f} 秒)，停止重试")
+                            self.stopped = True
+                            self.cond.notify_all()
+                            return None
+                        _, i, ready_at = heapq.heappop(self.retry_heap)
+                        CLOCK.sync(ready_at)
+                        self.in_progress += 1
+                        return i
+                    if not self.first_pass and not self.retry_heap and self.in_progress == 0:
+                        return None
+                    self.cond.wait(0.5 if not self.virtual else 0.05)
+            finally:
+                del self.waiting[worker]
+                self.cond.notify_all()
+
+    def worker_exit(self):
+        with self.cond:
+            self.active_workers -= 1
+            self.cond.notify_all()
+
+    def finish(self, elapsed, retry_item=None):
+        """一次尝试(含HTTP阶段)结束，需要重试时放入重试队列"""
+        with self.cond:
+            self.in_progress -= 1
+            self.attempt_seconds.append(elapsed)
+            if retry_item is not None:
+                heapq.heappush(self.retry_heap, retry_item + (CLOCK.monotonic(),))
+            self.cond.notify_all()
+
+def run_accounts(usernames, passwords, run_deadline, aggregator, account_budget=None, max_retries=3,
+                 workers=1, order=None, history=None):
+    """多个浏览器工作线程按顺序领取账号执行浏览器阶段，HTTP阶段交给后台流水线并行进行；
+    失败账号的重试延后到首轮之后，在剩余时间预算内按优先级执行。账号结束时结果即交给汇总器，不再保留"""
+    total_accounts = len(usernames)
+    results = {}  # 尚未结束的账号 -> 合并中的结果
+    attempts = [0] * total_accounts
+    spent = [0.0] * total_accounts
+    jindou_first_failed = [False] * total_accounts
+    lock = threading.Lock()
+    scheduler = WorkScheduler(order if order is not None else range(total_accounts), run_deadline, workers)
+
+    def finalize(i, result):
+        """账号结束：记录历史统计并交给汇总器"""
+        if history is not None:
+            history.record(account_key(usernames[i]), spent[i], attempts[i], result.login_timeouts,
+                           jindou_first_failed[i], result.succeeded)
+        aggregator.add(result)
+
+    def finish_attempt(job, result):
+        i = job['index']
+        account_index = i + 1
+        elapsed = CLOCK.monotonic() - job['started_at']
+        retry_item = None
+        try:
+            with lock:
+                attempts[i] += 1
+                spent[i] += elapsed
+                if attempts[i] == 1:
+                    jindou_first_failed[i] = not result.jindou_success
+                merged = results[i]
+                need_retry = merged.merge(result)
+
+                if not need_retry:
+                    pass
+                elif attempts[i] > max_retries:
+                    log(f"❌ 已达到最大重试次数 {max_retries}", account=account_index)
+                    need_retry = False
+                elif account_budget is not None and spent[i] >= account_budget:
+                    log(f"⏱ 账号时间预算 {account_budget} 秒已用完，不再重试", account=account_index)
+                    need_retry = False
+                else:
+                    retry_item = (merged.retry_priority(attempts[i]), i)
+                    log("🔄 签到未完全成功，重试延后到首轮结束后执行", account=account_index)
+                if not need_retry:
+                    del results[i]
+                    finalize(i, merged)
+            flush_account_log(account_index)
+        finally:
+            # 结果处理出错时也要归还任务名额，否则其他工作线程会一直等待
+            scheduler.finish(elapsed, retry_item)
+
+    # 金豆流程有多次接口往返和重试等待，耗时与浏览器阶段相当，每个浏览器工作线程配一个HTTP线程才不会积压
+    pipeline = HttpStagePipeline(finish_attempt, threads=workers)
+
+    def browser_worker(worker):
+        CLOCK.sync(start_time)
+        try:
+            while True:
+                i = scheduler.next_task(worker)
+                if i is None:
+                    return
+                account_index = i + 1
+                with lock:
+                    if attempts[i] == 0:
+                        log(f"开始处理第 {account_index} 个账号", account=account_index)
+                        results[i] = AccountResult(account_index)
+                    else:
+                        log(f"🔄 开始第 {attempts[i]} 次重试", account=account_index)
+                account_remaining = None if account_budget is None else account_budget - spent[i]
+                deadline = run_deadline.child(account_remaining)
+                started_at = CLOCK.monotonic()
+                try:
+                    with log_phase('browser'):
+                        result, credentials = PHASES.browser_stage(usernames[i], passwords[i], account_index, total_accounts,
+                                                                   retry_count=attempts[i], deadline=deadline)
+                except Exception as e:
+                    # 按一次失败的尝试处理，仍按规则决定是否重试
+                    log(f"❌ 浏览器阶段异常: {e}", account=account_index)
+                    result = AccountResult(account_index, attempts[i])
+                    result.oshwhub_status = '执行异常'
+                    result.jindou_status = '执行异常'
+                    finish_attempt({'index': i, 'started_at': started_at}, result)
+                else:
+                    pipeline.submit({'index': i, 'result': result, 'credentials': credentials,
+                                     'deadline': deadline, 'started_at': started_at})
+
+                wait_time = random.randint(3, 5)
+                log(f"等待 {wait_time} 秒后处理下一个账号...")
+                CLOCK.sleep(wait_time)
+        finally:
+            scheduler.worker_exit()
+
+    start_time = CLOCK.monotonic()
+    if workers > 1:
+        log(f"使用 {workers} 个浏览器工作线程并发处理")
+    threads = [threading.Thread(target=browser_worker, args=(w,), daemon=True) for w in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pipeline.close()
+
+    skipped = [i for i in range(total_accounts) if attempts[i] == 0]
+    if skipped:
+        log(f"⏱ 运行时间预算耗尽，未处理的账号: {', '.join(str(i + 1) for i in skipped)}")
+    if scheduler.retry_heap:
+        log(f"⏱ 运行时间预算耗尽，未完成重试的账号: {', '.join(str(item[1] + 1) for item in sorted(scheduler.retry_heap))}")
+
+    # 等待重试时预算耗尽的账号按已有的最好结果结束
+    for i in sorted(results):
+        finalize(i, results[i])
+    for i in skipped:
+        aggregator.add(AccountResult.budget_exhausted(i + 1))
+
+def account_key(username, salt=''):
+    """账号在本地文件中的标识。手机号的取值空间很小，不加盐的哈希可以被穷举还原，
+    只用于标识账号，不能当作保护；任务队列使用每个队列文件独立的随机盐"""
+    return hashlib.sha256((salt + username).encode('utf-8')).hexdigest()[:16]
+
+class AccountQueue:
+    """多个运行器共享的 SQLite 账号任务队列，支持租约过期回收和失败退避重试。
+    使用 WAL 日志模式，队列文件只能由同一台机器上的运行器共享，不支持 NFS 等网络文件系统"""
+
+    def __init__(self, path, run_key, runner_id, lease_seconds=600, max_attempts=4, account_budget=None):
+        self.run_key = run_key
+        self.runner_id = runner_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.account_budget = account_budget
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS account_queue (
+                run_key TEXT NOT NULL,
+                account_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                result_json TEXT,
+                spent REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (run_key, account_key)
+            )
+        """)
+        # 账号标识使用的随机盐，由第一个打开队列文件的运行器生成
+        self.conn.execute("CREATE TABLE IF NOT EXISTS queue_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute("INSERT OR IGNORE INTO queue_meta (name, value) VALUES ('salt', ?)", (os.urandom(16).hex(),))
+        self.salt = self.conn.execute("SELECT value FROM queue_meta WHERE name = 'salt'").fetchone()[0]
+        # 旧版本创建的队列文件没有累计耗时列
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(account_queue)")]
+        if 'spent' not in columns:
+            self.conn.execute("ALTER TABLE account_queue ADD COLUMN spent REAL NOT NULL DEFAULT 0")
+
+    def key(self, username):
+        """账号在本队列中的加盐标识"""
+        return account_key(username, self.salt)
+
+    def _transaction(self, func):
+        """在写事务中执行操作，避免多个运行器同时领取同一账号"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = func()
+                self.conn.execute("COMMIT")
+                return value
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, keys):
+        """登记账号，已存在的账号保持原有状态"""
+        def insert():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO account_queue (run_key, account_key) VALUES (?, ?)",
+                [(self.run_key, key) for key in keys]
+            )
+        self._transaction(insert)
+
+    def lease(self, keys):
+        """领取下一个可执行的账号，过期租约视为运行器已崩溃并回收"""
+        now = CLOCK.time()
+        placeholders = ",".join("?" * len(keys))
+
+        def take():
+            row = self.conn.execute(
+                f"""
+                SELECT account_key, attempts, status, result_json, spent FROM account_queue
+                WHERE run_key = ? AND account_key IN ({placeholders})
+                  AND ((status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))
+                ORDER BY available_at, attempts LIMIT 1
+                """,
+                [self.run_key] + list(keys) + [now, now]
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE account_queue SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ? "
+                "WHERE run_key = ? AND account_key = ?",
+                (self.runner_id, now + self.lease_seconds, self.run_key, row[0])
+            )
+            return {'key': row[0], 'attempts': row[1] + 1, 'reclaimed': row[2] == 'leased', 'result_json': row[3],
+                    'spent': row[4]}
+
+        return self._transaction(take)
+
+    def renew(self, key):
+        """延长当前运行器持有的租约"""
+        def update():
+            self.conn.execute(
+                "UPDATE account_queue SET lease_expires = ? WHERE run_key = ? AND account_key = ? AND lease_owner = ? AND status = 'leased'",
+                (CLOCK.time() + self.lease_seconds, self.run_key, key, self.runner_id)
+            )
+        self._transaction(update)
+
+    def complete(self, key, result, spent):
+        """标记账号处理完成，spent 为该账号各次尝试的累计耗时"""
+        def update():
+            self.conn.execute(
+                "UPDATE account_queue SET status = 'done', lease_owner = NULL, result_json = ?, spent = ? "
+                "WHERE run_key = ? AND account_key = ?",
+                (json.dumps(result, ensure_ascii=False), spent, self.run_key, key)
+            )
+        self._transaction(update)
+
+    def budget_left(self, spent):
+        """账号(含重试)的累计耗时是否还在单账号时间预算内"""
+        return self.account_budget is None or spent < self.account_budget
+
+    def fail(self, key, attempts, result, error, spent):
+        """账号处理失败，未超过最大尝试次数和单账号时间预算时按指数退避重新入队，返回退避秒数"""
+        if attempts >= self.max_attempts or not self.budget_left(spent):
+            status, delay = 'failed', 0
+        else:
+            status = 'pending'
+            delay = min(30 * 2 ** (attempts - 1), 600) * random.uniform(0.5, 1.0)
+
+        def update():
+            self.conn.execute(
+                "UPDATE account_queue SET status = ?, lease_owner = NULL, available_at = ?, last_error = ?, result_json = ?, "
+                "spent = ? WHERE run_key = ? AND account_key = ?",
+                (status, CLOCK.time() + delay, error, json.dumps(result, ensure_ascii=False), spent, self.run_key, key)
+            )
+        self._transaction(update)
+        return delay if status == 'pending' else None
+
+    def next_wait(self, keys):
+        """返回距离下一个账号可领取的秒数，所有账号都已结束时返回 None"""
+        placeholders = ",".join("?" * len(keys))
+        with self.lock:
+            row = self.conn.execute(
+                f"""
+                SELECT MIN(CASE WHEN status = 'pending' THEN available_at ELSE lease_expires END), COUNT(*)
+                FROM account_queue
+                WHERE run_key = ? AND account_key IN ({placeholders}) AND status IN ('pending', 'leased')
+                """,
+                [self.run_key] + list(keys)
+            ).fetchone()
+        if not row[1]:
+            return None
+        return max(0, row[0] - CLOCK.time())
+
+    def results(self, keys):
+        """读取账号的最终合并结果"""
+        placeholders = ",".join("?" * len(keys))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT account_key, result_json FROM account_queue WHERE run_key = ? AND account_key IN ({placeholders})",
+                [self.run_key] + list(keys)
+            ).fetchall()
+        return {key: json.loads(result_json) for key, result_json in rows if result_json}
+
+class LeaseHeartbeat:
+    """处理账号期间定期续租，防止长耗时账号被其他运行器回收"""
+
+    def __init__(self, queue, key):
+        self.queue = queue
+        self.key = key
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            try:
+                self.queue.renew(self.key)
+            except Exception as e:
+                log(f"⚠ 续租失败: {e}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+def run_queue_mode(args, usernames, passwords, run_deadline, aggregator):
+    """从共享队列中领取账号执行，直到本运行器负责的账号全部结束。
+    队列中不保存密码，运行器只能领取自己参数中的账号，要在运行器间均衡分配须给每个运行器传入相同的完整账号列表"""
+    run_key = args.queue_run_key or CLOCK.now().strftime('%Y-%m-%d')
+    runner_id = f"{socket.gethostname()}-{os.getpid()}"
+    queue = AccountQueue(args.queue, run_key, runner_id, args.lease_seconds, args.max_attempts, args.account_budget)
+
+    accounts = {}
+    for i, (username, password) in enumerate(zip(usernames, passwords), 1):
+        accounts[queue.key(username)] = (i, username, password)
+    keys = list(accounts)
+    total_accounts = len(keys)
+    queue.enqueue(keys)
+    log(f"任务队列模式: 队列 {args.queue}，批次 {run_key}，运行器 {runner_id}")
+
+    while True:
+        if not run_deadline.allows(60):
+            log("⏱ 运行时间预算即将耗尽，停止领取新账号，剩余账号留给其他运行器")
+            break
+        item = queue.lease(keys)
+        if item is None:
+            wait = queue.next_wait(keys)
+            if wait is None:
+                break
+            CLOCK.sleep(min(max(wait, 1), 15))
+            continue
+
+        key = item['key']
+        account_index, username, password = accounts[key]
+        if item['reclaimed']:
+            log("♻ 回收其他运行器过期的租约", account=account_index)
+
+        if item['result_json']:
+            merged_result = AccountResult.from_dict(json.loads(item['result_json']))
+        else:
+            merged_result = AccountResult(account_index)
+        merged_result.account_index = account_index
+
+        # 单账号时间预算按各次尝试(可能在不同运行器上)的累计耗时计算，与非队列模式一致
+        account_remaining = None if args.account_budget is None else args.account_budget - item['spent']
+        started_at = CLOCK.monotonic()
+        with LeaseHeartbeat(queue, key):
+            result = PHASES.sign_in_account(username, password, account_index, total_accounts,
+                                            retry_count=item['attempts'] - 1, deadline=run_deadline.child(account_remaining))
+        spent = item['spent'] + CLOCK.monotonic() - started_at
+        need_retry = merged_result.merge(result)
+
+        # 合并结果不含Cookie，落盘的结果中也就没有Cookie
+        stored_result = merged_result.to_dict()
+        if need_retry:
+            delay = queue.fail(key, item['attempts'], stored_result, f"{merged_result.oshwhub_status}/{merged_result.jindou_status}",
+                               spent)
+            if delay is not None:
+                log(f"🔄 重新入队，{delay:.0f} 秒后可再次领取", account=account_index)
+            elif not queue.budget_left(spent):
+                log(f"⏱ 账号时间预算 {args.account_budget} 秒已用完，不再重试", account=account_index)
+            else:
+                log(f"❌ 已达到最大尝试次数 {args.max_attempts}", account=account_index)
+        else:
+            queue.complete(key, stored_result, spent)
+        flush_account_log(account_index)
+
+        wait_time = random.randint(3, 5)
+        log(f"等待 {wait_time} 秒后领取下一个账号...")
+        CLOCK.sleep(wait_time)
+
+    # 汇总所有运行器的结果，礼包领取结果随账号结果一起保存在队列中
+    stored_results = queue.results(keys)
+    for key in keys:
+        account_index = accounts[key][0]
+        if key in stored_results:
+            result = AccountResult.from_dict(stored_results[key])
+        else:
+            result = AccountResult(account_index)
+        result.account_index = account_index
+        aggregator.add(result)
+
+def print_summary(aggregator, enable_failure_exit):
+    """输出详细总结并根据失败退出标志退出"""
+    total_accounts = aggregator.total_accounts
+    
+    # 输出详细总结
+    log("=" * 70)
+    log("📊 详细签到任务完成总结")
+    log("=" * 70)
+    
+    for account_index in sorted(aggregator.details):
+        for line in aggregator.detail_lines(account_index):
+            log(line)
         # 显示礼包领取结果
-        for reward_result in result['reward_results']:
-            log(f"  ├── {reward_result}")
-        
-        if result['oshwhub_success']:
-            oshwhub_success_count += 1
-        if result['jindou_success']:
-            jindou_success_count += 1
-        
+        for reward_result in aggregator.rewards.get(account_index, []):
+            log(f"  ├── {format_reward_result(reward_result)}")
         log("  " + "-" * 50)
     
     # 总体统计
     log("📈 总体统计:")
     log(f"  ├── 总账号数: {total_accounts}")
-    log(f"  ├── 开源平台签到成功: {oshwhub_success_count}/{total_accounts}")
-    log(f"  ├── 金豆签到成功: {jindou_success_count}/{total_accounts}")
+    log(f"  ├── 开源平台签到成功: {aggregator.oshwhub_success_count}/{total_accounts}")
+    log(f"  ├── 金豆签到成功: {aggregator.jindou_success_count}/{total_accounts}")
     
-    if total_points_reward > 0:
-        log(f"  ├── 总计获得积分: +{total_points_reward}")
+    if aggregator.total_points_reward > 0:
+        log(f"  ├── 总计获得积分: +{aggregator.total_points_reward}")
     
-    if total_jindou_reward > 0:
-        log(f"  ├── 总计获得金豆: +{total_jindou_reward}")
+    if aggregator.total_jindou_reward > 0:
+        log(f"  ├── 总计获得金豆: +{aggregator.total_jindou_reward}")
     
     # 计算成功率
-    oshwhub_rate = (oshwhub_success_count / total_accounts) * 100
-    jindou_rate = (jindou_success_count / total_accounts) * 100
+    oshwhub_rate = (aggregator.oshwhub_success_count / total_accounts) * 100
+    jindou_rate = (aggregator.jindou_success_count / total_accounts) * 100
     
     log(f"  ├── 开源平台成功率: {oshwhub_rate:.1f}%")
     log(f"  └── 金豆签到成功率: {jindou_rate:.1f}%")
     
     # 失败账号列表
-    failed_oshwhub = [r['account_index'] for r in all_results if not r['oshwhub_success']]
-    failed_jindou = [r['account_index'] for r in all_results if not r['jindou_success']]
+    failed_oshwhub = sorted(aggregator.failed_oshwhub)
+    failed_jindou = sorted(aggregator.failed_jindou)
     
     if failed_oshwhub:
         log(f"  ⚠ 开源平台失败账号: {', '.join(map(str, failed_oshwhub))}")
@@ -1038,12 +2782,17 @@ def main():
     if failed_jindou:
         log(f"  ⚠ 金豆签到失败账号: {', '.join(map(str, failed_jindou))}")
     
+    if aggregator.permanent_failures:
+        log(f"  ❌ 登录凭据或账号状态异常(未重试，请检查账号密码): "
+            + ', '.join(f"{i}({status})" for i, status in sorted(aggregator.permanent_failures.items())))
+    
     if not failed_oshwhub and not failed_jindou:
         log("  🎉 所有账号全部签到成功!")
     
     log("=" * 70)
     
     # 根据失败退出标志决定退出码
+    failed_accounts = aggregator.failed_accounts
     if enable_failure_exit and failed_accounts:
         log(f"❌ 检测到失败的账号: {', '.join(map(str, failed_accounts))}")
         log("❌ 由于失败退出功能已开启，返回报错退出码以获得邮件提醒")
@@ -1055,5 +2804,490 @@ def main():
             log("✅ 程序正常退出（失败退出未开启）")
         sys.exit(0)
 
+def query_account_status(username, account_index):
+    """用缓存的凭据查询账号当前状态，不执行签到；返回状态和失效的凭据种类"""
+    entry = CREDENTIALS.get(username)
+    status = {'account_index': account_index, 'nickname': '', 'points': None, 'jindou': None,
+              'jindou_signed': None, 'credentials_updated': entry.get('updated', '')}
+    expired = []
+
+    if entry.get('oshwhub_cookies'):
+        try:
+            user = fetch_oshwhub_user(entry['oshwhub_cookies'])
+            if user is None:
+                expired.append('oshwhub')
+            else:
+                status['nickname'] = format_nickname(user.get('nickname', ''))
+                status['points'] = user.get('points', 0)
+        except Exception as e:
+            # 网络错误和服务端错误不代表Cookie失效，不为此打开浏览器
+            log(f"⚠ 查询开源平台用户信息失败: {e}", account=account_index)
+    else:
+        expired.append('oshwhub')
+
+    if entry.get('access_token') and entry.get('secretkey'):
+        client = JLCClient(entry['access_token'], entry['secretkey'], account_index)
+        jlc_status = client.fetch_status()
+        if jlc_status is not None:
+            status.update(jlc_status)
+        elif client.auth_rejected:
+            expired.append('jlc')
+        # 超时或服务端错误只记为查询失败，不为此打开浏览器
+    else:
+        expired.append('jlc')
+
+    return status, expired
+
+def refresh_credentials(username, password, account_index):
+    """凭据失效时用浏览器登录(不签到)，重新获取金豆接口凭据和开源平台Cookie"""
+    try:
+        driver = create_driver(account_index)
+    except BrowserAdmissionError as e:
+        log(f"⚠ {e}", account=account_index)
+        return False
+    except Exception as e:
+        log(f"❌ 浏览器启动失败: {e}", account=account_index)
+        return False
+    try:
+        login_page_ready, driver = ensure_login_page(driver, account_index)
+        if not login_page_ready:
+            return False
+        error_status, _, _ = login_with_password(driver, username, password, account_index)
+        if error_status:
+            return False
+        oshwhub_cookies = get_driver_cookie_str(driver)
+        access_token, secretkey = obtain_jlc_credentials(driver, account_index)
+        credentials = {'access_token': access_token, 'secretkey': secretkey} if access_token and secretkey else {}
+        CREDENTIALS.update(username, credentials, oshwhub_cookies)
+        return True
+    except Exception as e:
+        log(f"❌ 重新登录失败: {e}", account=account_index)
+        return False
+    finally:
+        quit_driver(driver)
+
+def print_status(statuses, as_json):
+    """以表格或 JSON 输出账号状态"""
+    if as_json:
+        sys.stdout.write(json.dumps(statuses, ensure_ascii=False, indent=2) + "\n")
+        sys.stdout.flush()
+        return
+
+    def show(value):
+        if value is None:
+            return '-'
+        if value is True:
+            return '已签到'
+        if value is False:
+            return '未签到'
+        return str(value)
+
+    log("=" * 70)
+    log("📋 账号状态")
+    log("=" * 70)
+    log(f"{'账号':<6}{'昵称':<16}{'开源平台积分':>10}{'金豆':>8}  {'金豆签到':<8}{'状态'}")
+    for status in statuses:
+        log(f"{status['account_index']:<6}{status['nickname'] or '未知':<16}{show(status['points']):>10}"
+            f"{show(status['jindou']):>8}  {show(status['jindou_signed']):<8}{status['state']}")
+    signed = sum(1 for status in statuses if status['jindou_signed'])
+    unknown = sum(1 for status in statuses if status['state'] != '正常')
+    log(f"金豆今日已签到 {signed}/{len(statuses)}" + (f"，{unknown} 个账号状态不完整" if unknown else ""))
+    log("=" * 70)
+
+def run_status(args):
+    """只读状态查询：用缓存凭据并发查询所有账号，仅对凭据失效且提供了密码的账号重新登录"""
+    global CREDENTIALS, BROWSERS
+    usernames = [u.strip() for u in args.usernames.split(',') if u.strip()]
+    passwords = [p.strip() for p in args.passwords.split(',') if p.strip()] if args.passwords else []
+    if passwords and len(passwords) != len(usernames):
+        log("❌ 错误: 账号和密码数量不匹配!")
+        sys.exit(1)
+    CREDENTIALS = CredentialStore(args.credentials)
+
+    def query(i):
+        account_index = i + 1
+        status, expired = query_account_status(usernames[i], account_index)
+        flush_account_log(account_index)
+        return status, expired
+
+    start = CLOCK.monotonic()
+    statuses = [None] * len(usernames)
+    expired = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        for i, (status, missing) in enumerate(executor.map(query, range(len(usernames)))):
+            statuses[i] = status
+            if missing:
+                expired[i] = missing
+    log(f"已查询 {len(usernames)} 个账号，用时 {CLOCK.monotonic() - start:.1f} 秒，凭据失效 {len(expired)} 个")
+
+    if expired and passwords and not args.no_login:
+        log(f"使用浏览器重新登录凭据失效的账号: {', '.join(str(i + 1) for i in expired)}")
+        BROWSERS = make_browser_manager(args.remote_webdriver, args.memory_limit, args.browser_memory)
+
+        def relogin(i):
+            account_index = i + 1
+            if refresh_credentials(usernames[i], passwords[i], account_index):
+                statuses[i], expired[i] = query_account_status(usernames[i], account_index)
+                statuses[i]['source'] = 'login'
+            flush_account_log(account_index)
+
+        with ThreadPoolExecutor(max_workers=max(1, args.browser_workers)) as executor:
+            list(executor.map(relogin, list(expired)))
+        BROWSERS.close()
+        BROWSERS.report()
+
+    for i, status in enumerate(statuses):
+        status.setdefault('source', 'cache')
+        missing = expired.get(i)
+        if not missing:
+            status['state'] = '正常' if status['points'] is not None and status['jindou'] is not None else '查询失败'
+        elif len(missing) == 2:
+            status['state'] = '凭据失效' if status['credentials_updated'] else '无缓存凭据'
+        else:
+            status['state'] = '金豆凭据失效' if missing == ['jlc'] else '开源平台Cookie失效'
+    print_status(statuses, args.json)
+
+class SimulatedPhases(RunPhases):
+    """模拟模式下的各阶段：按耗时分布推进虚拟时钟，并按概率制造失败，不访问浏览器和网络"""
+
+    # 浏览器阶段各步骤的耗时范围(秒)，参考真实流程中的固定等待
+    BROWSER_DURATIONS = [
+        ('启动浏览器', 2, 4),
+        ('进入登录页', 7, 10),
+        ('账号登录与滑块', 8, 12),
+        ('等待登录跳转', 2, 20),
+        ('开源平台签到', 14, 18),
+        ('m.jlc.com 抓取凭据', 3, 12),
+    ]
+    # HTTP阶段各步骤的耗时范围(秒)
+    HTTP_DURATIONS = [
+        ('开源平台积分查询', 1, 2),
+        ('金豆签到接口', 5, 9),
+    ]
+
+    def __init__(self, rng, failure_rate, slow_rate, bad_credential_rate=0.0):
+        self.rng = rng
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.bad_credential_rate = bad_credential_rate
+        self.bad_credentials = {}  # 账号 -> 是否模拟为密码错误，同一账号每次尝试结果一致
+        self.lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.retry_seconds = 0.0
+        self.browser_seconds = 0.0
+        self.attempt_seconds = []
+        self.account_seconds = {}
+        self.started = {}
+        self.intervals = []  # 每次尝试在虚拟时间上的起止，用于计算并发
+        self.gift_seconds = 0.0
+
+    def _run_steps(self, durations, deadline):
+        """依次推进各步骤耗时，预算不足时只推进到预算耗尽并返回 False"""
+        for duration in durations:
+            if deadline is not None and not deadline.allows(duration):
+                CLOCK.sleep(deadline.remaining())
+                return False
+            CLOCK.sleep(duration)
+        return True
+
+    def browser_stage(self, username, password, account_index, total_accounts, retry_count=0, deadline=None):
+        start = CLOCK.monotonic()
+        self.started[account_index] = start
+
+        result = AccountResult(account_index, retry_count)
+        result.nickname = f"模拟{account_index}"
+        credentials = {}
+
+        durations = [self.rng.uniform(low, high) for _, low, high in self.BROWSER_DURATIONS]
+        with self.lock:
+            if account_index not in self.bad_credentials:
+                self.bad_credentials[account_index] = self.rng.random() < self.bad_credential_rate
+            bad_credentials = self.bad_credentials[account_index]
+        if bad_credentials:
+            # 登录页提示账号或密码错误，点击登录后约1秒即可识别并结束
+            durations = durations[:2] + [self.rng.uniform(1, 2)]
+            self._run_steps(durations, deadline)
+            result.oshwhub_status = result.jindou_status = '账号或密码错误'
+            result.permanent_failure = True
+            with self.lock:
+                self.browser_seconds += CLOCK.monotonic() - start
+            return result, credentials
+        if self.rng.random() < self.slow_rate:
+            # 登录跳转超时，走满 25×2 秒的等待
+            durations[3] += 50
+            result.login_timeout = True
+        if not self._run_steps(durations, deadline):
+            result.oshwhub_status = '时间预算耗尽'
+            result.jindou_status = '时间预算耗尽'
+        else:
+            if self.rng.random() >= self.failure_rate:
+                result.oshwhub_success = True
+                result.oshwhub_status = '签到成功'
+                result.oshwhub_cookies = 'simulated'
+                # 在签到页上逐个点击礼包按钮，等待奖励提示，两个礼包之间刷新一次页面
+                gift_start = CLOCK.monotonic()
+                for gift in get_due_gifts():
+                    CLOCK.sleep(self.rng.uniform(1.5, 4))
+                    result.reward_results.append(make_reward_result(gift, True, '模拟奖励'))
+                with self.lock:
+                    self.gift_seconds += CLOCK.monotonic() - gift_start
+            else:
+                result.oshwhub_status = '签到失败'
+            if self.rng.random() >= self.failure_rate:
+                result.token_extracted = result.secretkey_extracted = True
+                credentials = {'access_token': 'simulated', 'secretkey': 'simulated'}
+            else:
+                result.jindou_status = 'Token提取失败'
+
+        with self.lock:
+            self.browser_seconds += CLOCK.monotonic() - start
+        return result, credentials
+
+    def http_stage(self, result, credentials, deadline=None):
+        account_index = result.account_index
+        try:
+            durations = [self.rng.uniform(low, high) for _, low, high in self.HTTP_DURATIONS]
+            if not credentials:
+                durations = durations[:1]
+            if not self._run_steps(durations, deadline):
+                if credentials:
+                    result.jindou_status = '时间预算耗尽'
+            elif credentials:
+                if self.rng.random() >= self.failure_rate:
+                    result.jindou_success = True
+                    result.jindou_status = '签到成功'
+                else:
+                    result.jindou_status = '签到失败'
+            return result
+        finally:
+            end = CLOCK.monotonic()
+            start = self.started.pop(account_index, end)
+            elapsed = end - start
+            with self.lock:
+                self.intervals.append((start, end))
+                self.attempts += 1
+                self.attempt_seconds.append(elapsed)
+                self.account_seconds[account_index] = self.account_seconds.get(account_index, 0.0) + elapsed
+                if result.retry_count > 0:
+                    self.retries += 1
+                    self.retry_seconds += elapsed
+
+    def report(self, total_accounts, elapsed):
+        """输出模拟运行的预计耗时、并发和重试负载"""
+        def percentile(values, q):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        account_seconds = list(self.account_seconds.values())
+        peak_concurrency = 0
+        concurrency = 0
+        for _, delta in sorted([(start, 1) for start, _ in self.intervals] + [(end, -1) for _, end in self.intervals]):
+            concurrency += delta
+            peak_concurrency = max(peak_concurrency, concurrency)
+        log("=" * 70)
+        log("🧪 模拟运行报告")
+        log("=" * 70)
+        log(f"  ├── 模拟日期: {CLOCK.start.strftime('%Y-%m-%d %A')}，今日礼包: {'、'.join(g['gift_name'] for g in get_due_gifts()) or '无'}")
+        log(f"  ├── 账号数: {total_accounts}")
+        log(f"  ├── 预计总耗时: {timedelta(seconds=int(elapsed))}")
+        log(f"  ├── 峰值并发账号数: {peak_concurrency}")
+        if self.attempts:
+            log(f"  ├── 浏览器占用时长: {timedelta(seconds=int(self.browser_seconds))} (平均每次尝试 {self.browser_seconds / self.attempts:.0f} 秒)")
+        log(f"  ├── 总尝试次数: {self.attempts}，其中重试 {self.retries} 次")
+        # 重试耗时是各次重试尝试的耗时之和，并发时会超过总耗时，因此按所有尝试的累计耗时计算占比
+        attempt_total = sum(self.attempt_seconds)
+        if attempt_total > 0:
+            log(f"  ├── 重试累计耗时: {timedelta(seconds=int(self.retry_seconds))} (占全部尝试累计耗时 {self.retry_seconds / attempt_total * 100:.1f}%)")
+        log(f"  ├── 浏览器内领取礼包累计耗时: {self.gift_seconds:.1f} 秒")
+        log(f"  ├── 单次尝试耗时 P50/P95/最大: {percentile(self.attempt_seconds, 0.5):.0f}/{percentile(self.attempt_seconds, 0.95):.0f}/{max(self.attempt_seconds or [0]):.0f} 秒")
+        log(f"  └── 单账号总耗时 P50/P95/最大: {percentile(account_seconds, 0.5):.0f}/{percentile(account_seconds, 0.95):.0f}/{max(account_seconds or [0]):.0f} 秒")
+        if elapsed > 6 * 3600:
+            log("  ⚠ 预计耗时超过 Github Actions 单次任务 6 小时限制，请拆分账号或增加运行器")
+        log("=" * 70)
+
+def setup_simulation(args):
+    """切换到虚拟时钟和模拟阶段，返回模拟账号列表"""
+    global CLOCK, PHASES
+    start = datetime.strptime(args.sim_date, '%Y-%m-%d') if args.sim_date else datetime.now()
+    start = start.replace(hour=10, minute=0, second=0, microsecond=0)
+    CLOCK = VirtualClock(start)
+    random.seed(args.sim_seed)
+    PHASES = SimulatedPhases(random.Random(args.sim_seed), args.sim_failure_rate, args.sim_slow_rate,
+                             args.sim_bad_credential_rate)
+    log(f"🧪 模拟模式: {args.simulate} 个账号，虚拟起始时间 {start}，单次失败率 {args.sim_failure_rate}")
+    usernames = [f"sim{i}" for i in range(1, args.simulate + 1)]
+    return usernames, list(usernames)
+
+def parse_args(argv):
+    """解析命令行参数，兼容原有的位置参数用法"""
+    parser = argparse.ArgumentParser(
+        prog="python jlc.py",
+        description="嘉立创自动签到脚本",
+        epilog=(
+            "示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3\n"
+            "示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3 true\n"
+            "示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3 --queue /data/jlc-queue.db"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('usernames', nargs='?', help="账号1,账号2,账号3...")
+    parser.add_argument('passwords', nargs='?', help="密码1,密码2,密码3...")
+    parser.add_argument('failure_exit', nargs='?', default='',
+                        help="失败退出标志: 不传或任意值-关闭, true-开启(任意账号签到失败时返回非零退出码)")
+    parser.add_argument('--queue', metavar='PATH',
+                        help="共享的 SQLite 任务队列文件，多个运行器从同一队列动态领取账号")
+    parser.add_argument('--queue-run-key', metavar='KEY', help="队列批次标识，默认为当天日期")
+    parser.add_argument('--lease-seconds', type=int, default=600, help="账号租约时长(秒)，超时未续租视为运行器崩溃")
+    parser.add_argument('--max-attempts', type=int, default=4, help="队列模式下每个账号的最大尝试次数")
+    parser.add_argument('--run-budget', type=float, metavar='SECONDS',
+                        help="整轮运行的时间预算，耗尽后停止处理并输出已有结果")
+    parser.add_argument('--account-budget', type=float, metavar='SECONDS',
+                        help="单个账号(含重试)的时间预算")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="并发的浏览器工作线程数，默认 1")
+    parser.add_argument('--history', metavar='PATH',
+                        help="账号历史统计文件，用于安排处理顺序，默认 .jlc_history.json(模拟模式默认不使用)")
+    parser.add_argument('--no-history', action='store_true', help="不读取也不记录历史统计，按参数顺序处理")
+    parser.add_argument('--credentials', metavar='PATH',
+                        help="凭据缓存文件，保存各账号的金豆接口凭据和开源平台Cookie供 status 命令使用，默认 .jlc_credentials.json")
+    parser.add_argument('--no-credentials', action='store_true', help="不保存凭据缓存")
+    parser.add_argument('--memory-limit', type=int, metavar='MB',
+                        help="所有浏览器合计的内存上限，启动新浏览器会超出时等待其他浏览器释放")
+    parser.add_argument('--browser-memory', type=int, default=400, metavar='MB',
+                        help="单个浏览器的预估内存占用，用于准入判断，默认 400")
+    parser.add_argument('--remote-webdriver', metavar='URL[#N]', type=parse_remote_node, action='append',
+                        help="在远程 WebDriver/Selenium Grid 节点上启动浏览器，可重复指定多个节点，"
+                             "#N 为该节点同时运行的会话上限(默认 1)；指定后不在本机启动 Chrome")
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text',
+                        help="控制台日志格式：text 为可读文本，json 为每行一条结构化记录")
+    parser.add_argument('--log-json', metavar='PATH', help="另外将结构化日志追加写入该文件")
+    parser.add_argument('--no-log-buffer', action='store_true',
+                        help="关闭按账号缓冲，日志产生后立即输出")
+    parser.add_argument('--profile', metavar='DIR', nargs='?', const='',
+                        help="开启性能分析，按阶段输出 cProfile/pstats 和 tracemalloc 结果，默认目录 profiles/<时间>")
+    parser.add_argument('--simulate', metavar='N', type=int,
+                        help="模拟模式：用虚拟时钟和模拟阶段跑完 N 个账号的完整编排，输出预计耗时、并发和重试负载")
+    parser.add_argument('--sim-date', metavar='YYYY-MM-DD', help="模拟运行的日期，用于验证周日、月底礼包规则")
+    parser.add_argument('--sim-seed', type=int, default=0, help="模拟随机种子")
+    parser.add_argument('--sim-failure-rate', type=float, default=0.05, help="模拟时每次尝试单项签到失败的概率")
+    parser.add_argument('--sim-slow-rate', type=float, default=0.1, help="模拟时登录跳转超时的概率")
+    parser.add_argument('--sim-bad-credential-rate', type=float, default=0.0, help="模拟账号密码错误的账号比例")
+    args = parser.parse_args(argv)
+    if args.simulate is None and (not args.usernames or not args.passwords):
+        parser.error("需要提供账号和密码")
+    if args.profile == '':
+        args.profile = os.path.join('profiles', datetime.now().strftime('%Y%m%d-%H%M%S'))
+    return args
+
+def parse_status_args(argv):
+    """解析 status 子命令参数"""
+    parser = argparse.ArgumentParser(
+        prog="python jlc.py status",
+        description="只读查询各账号当前的开源平台积分、金豆数量和今日金豆签到状态，不执行签到",
+        epilog="示例: python jlc.py status user1,user2,user3 pwd1,pwd2,pwd3 --json",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('usernames', help="账号1,账号2,账号3...")
+    parser.add_argument('passwords', nargs='?', help="密码1,密码2,密码3...，提供时凭据失效的账号会用浏览器重新登录(不签到)")
+    parser.add_argument('--credentials', metavar='PATH', default='.jlc_credentials.json', help="凭据缓存文件")
+    parser.add_argument('--json', action='store_true', help="以 JSON 输出结果，日志改为输出到标准错误")
+    parser.add_argument('--workers', type=int, default=16, help="并发查询的账号数，默认 16")
+    parser.add_argument('--browser-workers', type=int, default=1, help="重新登录时并发的浏览器数，默认 1")
+    parser.add_argument('--no-login', action='store_true', help="凭据失效时不打开浏览器，只报告失效")
+    parser.add_argument('--memory-limit', type=int, metavar='MB', help="重新登录时所有浏览器合计的内存上限")
+    parser.add_argument('--browser-memory', type=int, default=400, metavar='MB', help="单个浏览器的预估内存占用")
+    parser.add_argument('--remote-webdriver', metavar='URL[#N]', type=parse_remote_node, action='append',
+                        help="重新登录时在远程 WebDriver 节点上启动浏览器，可重复指定，#N 为节点会话上限")
+    return parser.parse_args(argv)
+
+def main():
+    global PROFILER
+    if sys.argv[1:2] == ['status']:
+        args = parse_status_args(sys.argv[2:])
+        setup_logging('text', stream=sys.stderr if args.json else sys.stdout)
+        try:
+            run_status(args)
+        finally:
+            shutdown_logging()
+        return
+
+    args = parse_args(sys.argv[1:])
+    
+    setup_logging(args.log_format, args.log_json, buffer_accounts=not args.no_log_buffer)
+    try:
+        if args.profile:
+            PROFILER = PhaseProfiler(args.profile)
+            log(f"性能分析模式: 开启，结果目录 {args.profile}")
+        try:
+            run(args)
+        finally:
+            if PROFILER is not None:
+                PROFILER.write_report()
+    finally:
+        shutdown_logging()
+
+def run(args):
+    """执行签到任务"""
+    global BROWSERS, CREDENTIALS
+    if args.simulate is not None:
+        usernames, passwords = setup_simulation(args)
+    else:
+        usernames = [u.strip() for u in args.usernames.split(',') if u.strip()]
+        passwords = [p.strip() for p in args.passwords.split(',') if p.strip()]
+    
+    # 解析失败退出标志，默认为关闭
+    enable_failure_exit = (args.failure_exit.lower() == 'true')
+    
+    log(f"失败退出功能: {'开启' if enable_failure_exit else '关闭'}")
+    
+    if len(usernames) != len(passwords):
+        log("❌ 错误: 账号和密码数量不匹配!")
+        sys.exit(1)
+    
+    total_accounts = len(usernames)
+    log(f"开始处理 {total_accounts} 个账号的签到任务")
+    
+    BROWSERS = make_browser_manager(args.remote_webdriver, args.memory_limit, args.browser_memory)
+    if args.simulate is None:
+        BROWSERS.reap_orphans()
+    
+    if args.simulate is None and not args.no_credentials:
+        CREDENTIALS = CredentialStore(args.credentials or '.jlc_credentials.json')
+    
+    run_deadline = Deadline(args.run_budget)
+    if args.run_budget is not None or args.account_budget is not None:
+        log(f"时间预算: 整轮 {args.run_budget or '不限'} 秒，单账号 {args.account_budget or '不限'} 秒")
+    
+    aggregator = RunAggregator(total_accounts)
+    if args.queue:
+        run_queue_mode(args, usernames, passwords, run_deadline, aggregator)
+    else:
+        history_path = args.history if args.history is not None else (None if args.simulate is not None else '.jlc_history.json')
+        history = AccountHistory(history_path) if history_path and not args.no_history else None
+        order = None
+        if history is not None:
+            order = history.order([account_key(u) for u in usernames])
+            if order != sorted(order):
+                preview = ', '.join(str(i + 1) for i in order[:20]) + (' ...' if len(order) > 20 else '')
+                log(f"根据历史统计调整处理顺序(慢且不稳定的账号优先): {preview}")
+        run_accounts(usernames, passwords, run_deadline, aggregator, args.account_budget,
+                     workers=args.workers, order=order, history=history)
+        if history is not None:
+            history.save()
+    
+    BROWSERS.close()
+    if args.simulate is None:
+        BROWSERS.reap_orphans()
+    BROWSERS.report()
+    
+    if args.simulate is not None:
+        PHASES.report(total_accounts, CLOCK.latest)
+    
+    with profiled_phase("summary"), log_phase('summary'):
+        print_summary(aggregator, enable_failure_exit)
+
 if __name__ == "__main__":
     main()